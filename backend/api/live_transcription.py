@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from typing import Optional
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from config import config
+from services.audio_decoding import AudioDecodingError, FfmpegStreamDecoder, Pcm16Converter
+from services.inference_executor import run_whisper
+from services.live_transcription import LiveTranscriptionSession, words_text
+from services.whisper_model import get_whisper_model
+
+router = APIRouter()
+
+def final_event(words) -> dict:
+    return {"type": "final", "text": words_text(words), "start": words[0][0], "end": words[-1][1]}
+
+@router.websocket("/ws/transcribe")
+async def transcribe_live(websocket: WebSocket, format: str = "pcm16", language: Optional[str] = None):
+    """
+    Live captioning. Send binary audio frames: 16 kHz mono 16-bit PCM by default,
+    or a compressed stream such as webm/Opus with ?format=webm (decoded by ffmpeg).
+    The server pushes {"type": "partial"} messages with the tentative tail and
+    {"type": "final"} messages once words are stable. Send the text message
+    "stop" to flush and receive {"type": "done"} with the full transcript.
+    """
+    await websocket.accept()
+    try:
+        await run_whisper(get_whisper_model)
+    except Exception as e:
+        await websocket.send_json({"type": "error", "detail": f"Whisper model not available: {str(e)}"})
+        await websocket.close(code=1011)
+        return
+
+    session = LiveTranscriptionSession(language)
+    stopped = asyncio.Event()
+    decoder = None
+    reader = None
+    if format != "pcm16":
+        try:
+            decoder = await FfmpegStreamDecoder(None if format == "auto" else format).start()
+        except AudioDecodingError as e:
+            await websocket.send_json({"type": "error", "detail": f"Audio decoder not available: {str(e)}"})
+            await websocket.close(code=1011)
+            return
+
+        async def read_decoded():
+            async for samples in decoder.samples():
+                session.add_audio(samples)
+
+        reader = asyncio.ensure_future(read_decoded())
+
+    async def decode_loop():
+        while not stopped.is_set():
+            try:
+                await asyncio.wait_for(stopped.wait(), config.LIVE_TRANSCRIBE_INTERVAL_MS / 1000)
+            except asyncio.TimeoutError:
+                pass
+            if stopped.is_set() or not session.has_new_audio():
+                continue
+            new_words, tentative = await run_whisper(session.step)
+            if new_words:
+                await websocket.send_json(final_event(new_words))
+            await websocket.send_json({"type": "partial", "text": words_text(tentative)})
+
+    decoding = asyncio.ensure_future(decode_loop())
+    converter = Pcm16Converter()
+    connected = True
+    try:
+        while not decoding.done():
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                connected = False
+                break
+            if message.get("bytes"):
+                if decoder is not None:
+                    await decoder.write(message["bytes"])
+                else:
+                    session.add_audio(converter.feed(message["bytes"]))
+            elif message.get("text", "").strip().lower() == "stop":
+                break
+
+        stopped.set()
+        await decoding
+        if connected:
+            # Flush: drain the decoder, decode the remaining audio and commit the tail
+            if decoder is not None:
+                await decoder.close_input()
+                await reader
+            if session.buffered_seconds:
+                new_words, _ = await run_whisper(session.step)
+                if new_words:
+                    await websocket.send_json(final_event(new_words))
+            tail = session.finish()
+            if tail:
+                await websocket.send_json(final_event(tail))
+            await websocket.send_json({"type": "done", "text": words_text(session.committed), "language": session.language})
+            await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logging.error(f"Live transcription session failed: {e}")
+        try:
+            await websocket.send_json({"type": "error", "detail": f"Transcription failed: {str(e)}"})
+            await websocket.close(code=1011)
+        except Exception:
+            pass
+    finally:
+        stopped.set()
+        decoding.cancel()
+        if reader is not None:
+            reader.cancel()
+        if decoder is not None:
+            await decoder.aclose()
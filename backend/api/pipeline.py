@@ -0,0 +1,121 @@
+import asyncio
+import base64
+import json
+import time
+from typing import Optional
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+from config import config
+from api.transcribe import decode_upload, transcribe_samples
+from services.pose_service import get_or_fetch_pose
+from services.readability import is_already_simple
+from services.signwriting_translator import InvalidLanguageError, model_path_for, translate_text
+from services.text_simplifier import simplify_with_source
+
+router = APIRouter()
+
+def elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+@router.post("/pipeline")
+async def pipeline(
+    audio: Optional[UploadFile] = File(None),
+    text: Optional[str] = Form(None),
+    spoken_language: str = Form("en"),
+    signed_language: str = Form("ase"),
+    simplify: bool = Form(True),
+):
+    """
+    Run transcribe -> simplify -> (signwriting translation | pose generation)
+    in one request and stream each stage's result as an NDJSON line the moment
+    it completes. Signwriting and pose run concurrently once the text is final,
+    so their lines may arrive in either order. Every line carries the stage's
+    own "elapsed_ms" and "at_ms" since the request started; a stage that fails
+    sends an "error" line instead, and a final "done" line lists all timings.
+    """
+    if (audio is None) == (text is None):
+        raise HTTPException(status_code=400, detail="Send either an audio file or text.")
+    try:
+        model_path_for(spoken_language, signed_language)
+    except InvalidLanguageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    request_start = time.perf_counter()
+    timings = {}
+    if audio is not None:
+        # Decoded up front so oversized or undecodable uploads fail with a proper status code
+        samples = await decode_upload(audio)
+        timings["decode"] = elapsed_ms(request_start)
+
+    def event(stage: str, stage_start: float, **data) -> str:
+        timings[stage] = elapsed_ms(stage_start)
+        return json.dumps({"stage": stage, **data, "elapsed_ms": timings[stage], "at_ms": elapsed_ms(request_start)}) + "\n"
+
+    async def run_transcribe():
+        start = time.perf_counter()
+        try:
+            transcription = await transcribe_samples(samples)
+            return transcription, event("transcribe", start, text=transcription)
+        except HTTPException as e:
+            return None, event("transcribe", start, error=e.detail, status_code=e.status_code)
+        except Exception as e:
+            # e.g. Whisper failing mid-decode; the stream still ends with error and done lines
+            return None, event("transcribe", start, error=f"Transcription failed: {str(e)}", status_code=500)
+
+    async def run_simplify(source_text: str):
+        start = time.perf_counter()
+        if not simplify:
+            return source_text, event("simplify", start, text=source_text, source="skipped")
+        if is_already_simple(source_text):
+            return source_text.strip(), event("simplify", start, text=source_text.strip(), source="bypass")
+        if not config.GROQ_API_KEY:
+            return source_text, event("simplify", start, text=source_text, error="Groq API key not configured.")
+        try:
+            simplified_text, source = await simplify_with_source(source_text)
+            return simplified_text, event("simplify", start, text=simplified_text, source=source)
+        except Exception as e:
+            # Later stages carry on with the unsimplified text
+            return source_text, event("simplify", start, text=source_text, error=f"Simplification failed: {str(e)}")
+
+    async def run_signwriting(final_text: str):
+        start = time.perf_counter()
+        try:
+            signwriting = await translate_text(final_text, spoken_language, signed_language)
+            return event("signwriting", start, signwriting=signwriting)
+        except Exception as e:
+            return event("signwriting", start, error=f"Translation failed: {str(e)}")
+
+    async def run_pose(final_text: str):
+        start = time.perf_counter()
+        try:
+            pose_data = await get_or_fetch_pose(final_text, spoken_language, signed_language)
+            return event(
+                "pose", start, pose_data=base64.b64encode(pose_data).decode('utf-8'), data_format="binary_base64"
+            )
+        except Exception as e:
+            return event("pose", start, error=f"Pose generation failed: {str(e)}")
+
+    async def events():
+        source_text = text
+        if audio is not None:
+            source_text, line = await run_transcribe()
+            yield line
+            if source_text is None:
+                yield json.dumps({"stage": "done", "error": "Transcription failed.", "timings": timings}) + "\n"
+                return
+        if not source_text.strip():
+            yield json.dumps({"stage": "done", "error": "No text to translate.", "timings": timings}) + "\n"
+            return
+
+        final_text, line = await run_simplify(source_text)
+        yield line
+
+        tasks = [asyncio.ensure_future(run_signwriting(final_text)), asyncio.ensure_future(run_pose(final_text))]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+        yield json.dumps({"stage": "done", "text": final_text, "timings": timings, "total_ms": elapsed_ms(request_start)}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
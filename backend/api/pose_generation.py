@@ -1,7 +1,18 @@
-import requests
-from fastapi import APIRouter, HTTPException
+import base64
+import httpx
+import logging
+import os
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Header, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
 from config import config
+from services.inference_executor import run_blocking, run_in_process
+from services.pose_cache import pose_cache, pose_cache_key
+from services.pose_service import fetch_pose, get_or_fetch_pose, open_pose_stream, read_file
+from services.pose_assembly import assemble_sentence_pose
+from services.pose_processing import COMPACT_MEDIA_TYPE, PRECISIONS, process_pose
 
 router = APIRouter()
 
@@ -9,37 +20,201 @@ class PoseRequest(BaseModel):
     text: str
     spoken_language: str = "en"
     signed_language: str = "ase"
+    # "sentence" asks the pose API for the whole text; "words" assembles it from per-word clips
+    mode: str = "sentence"
+    # Optional server-side reduction: target frame rate, keypoint groups to remove
+    # (e.g. "FACE_LANDMARKS") and coordinate precision ("float32", "float16" or "int16")
+    fps: Optional[float] = None
+    drop_components: List[str] = []
+    precision: str = "float32"
+
+def wants_processing(request: PoseRequest) -> bool:
+    return bool(request.fps or request.drop_components or request.precision != "float32")
+
+def cache_variant(request: PoseRequest) -> str:
+    variant = "words" if request.mode == "words" else ""
+    if wants_processing(request):
+        drop = ",".join(sorted(request.drop_components))
+        variant += f"|fps={request.fps or ''}|drop={drop}|precision={request.precision}"
+    return variant
+
+def wants_binary(format: Optional[str], accept: Optional[str]) -> bool:
+    """Binary is chosen by ?format=binary or an Accept header preferring application/octet-stream"""
+    if format:
+        return format.lower() == "binary"
+    return bool(accept) and "application/octet-stream" in accept and "application/json" not in accept
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
+
+def media_type_for(precision: str) -> str:
+    return "application/octet-stream" if precision == "float32" else COMPACT_MEDIA_TYPE
+
+def representation_etag(etag: Optional[str], binary: bool) -> Optional[str]:
+    """The cache ETag names the binary body; the base64 JSON body gets its own validator"""
+    if not etag or binary:
+        return etag
+    return etag[:-1] + '-json"'
+
+def open_cached_file(path: str):
+    """Open a cached pose and return (file, size); an open file survives a concurrent eviction"""
+    file = open(path, "rb")
+    return file, os.fstat(file.fileno()).st_size
+
+async def file_chunks(file):
+    try:
+        while True:
+            chunk = await run_blocking(file.read, config.POSE_STREAM_CHUNK_BYTES)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        file.close()
+
+def json_pose_response(pose_data: bytes, etag: Optional[str] = None, precision: str = "float32"):
+    body = {
+        "pose_data": base64.b64encode(pose_data).decode('utf-8'),
+        "data_format": "binary_base64" if precision == "float32" else f"npz_{precision}_base64"
+    }
+    etag = representation_etag(etag, binary=False)
+    headers = {"ETag": etag} if etag else None
+    return JSONResponse(content=body, headers=headers)
+
+def pose_response(pose_data: bytes, etag: Optional[str], binary: bool, precision: str = "float32"):
+    if binary:
+        return Response(
+            content=pose_data, media_type=media_type_for(precision), headers={"ETag": etag} if etag else None
+        )
+    return json_pose_response(pose_data, etag, precision)
 
 @router.post("/generate_pose")
-async def generate_pose(request: PoseRequest):
+async def generate_pose(
+    request: PoseRequest,
+    format: Optional[str] = Query(None, description="'json' (base64, default) or 'binary'"),
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+):
     """
     Generate pose data from text using the translate project's API
     """
+    if request.mode not in ("sentence", "words"):
+        raise HTTPException(status_code=400, detail=f"Unknown pose mode: {request.mode}")
+    if request.precision not in PRECISIONS:
+        raise HTTPException(status_code=400, detail=f"Unknown precision: {request.precision}")
+    if request.fps is not None and request.fps <= 0:
+        raise HTTPException(status_code=400, detail="fps must be positive")
+    binary = wants_binary(format, accept)
+    key = pose_cache_key(request.text, request.spoken_language, request.signed_language, cache_variant(request))
+
+    # Cache hits are served even while the upstream pose service is down
+    cached = pose_cache.get(key)
+    if cached is not None:
+        etag = representation_etag(cached.etag, binary)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        try:
+            if binary:
+                file, size = await run_blocking(open_cached_file, cached.path)
+                return StreamingResponse(
+                    file_chunks(file),
+                    media_type=media_type_for(request.precision),
+                    headers={"ETag": etag, "Content-Length": str(size)},
+                    background=BackgroundTask(file.close),
+                )
+            return json_pose_response(await run_blocking(read_file, cached.path), cached.etag, request.precision)
+        except FileNotFoundError:
+            pass  # evicted between lookup and open; fall through to the upstream
+
+    if wants_processing(request):
+        return await generate_processed_pose(request, key, binary)
+    if request.mode == "words":
+        return await generate_pose_from_words(request, key, binary)
+    if binary:
+        return await generate_pose_binary(request, key)
     try:
-        # Construct the API URL
-        params = {
-            'text': request.text,
-            'spoken': request.spoken_language,
-            'signed': request.signed_language
-        }
-        
-        # Make the API call - it returns binary pose data directly
-        response = requests.get(config.POSE_API_URL, params=params)
-        response.raise_for_status()
-        
         # The API returns binary pose data directly
-        pose_data = response.content
-        
-        # For now, we'll return the binary data as base64 encoded
-        import base64
-        pose_data_b64 = base64.b64encode(pose_data).decode('utf-8')
-        
-        return {
-            "pose_data": pose_data_b64,
-            "data_format": "binary_base64"
-        }
+        pose_data = await fetch_pose(request.text, request.spoken_language, request.signed_language)
+        entry = await run_blocking(pose_cache.put, key, pose_data)
+        return json_pose_response(pose_data, entry.etag if entry else None)
         
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=503, detail=f"Pose generation failed: {str(e)}")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+
+async def generate_pose_from_words(request: PoseRequest, key: str, binary: bool):
+    """Assemble the sentence locally from per-word clips; only unseen words hit the upstream"""
+    try:
+        pose_data = await assemble_sentence_pose(request.text, request.spoken_language, request.signed_language)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=503, detail=f"Pose generation failed: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+
+    entry = await run_blocking(pose_cache.put, key, pose_data)
+    return pose_response(pose_data, entry.etag if entry else None, binary)
+
+async def generate_processed_pose(request: PoseRequest, key: str, binary: bool):
+    """Decode the full-resolution pose and reduce its frame rate, keypoints and precision before sending it"""
+    try:
+        if request.mode == "words":
+            source = await assemble_sentence_pose(request.text, request.spoken_language, request.signed_language)
+        else:
+            source = await get_or_fetch_pose(request.text, request.spoken_language, request.signed_language)
+        pose_data = await run_in_process(
+            process_pose, source, request.fps, request.drop_components, request.precision
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=503, detail=f"Pose generation failed: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+
+    entry = await run_blocking(pose_cache.put, key, pose_data)
+    return pose_response(pose_data, entry.etag if entry else None, binary, request.precision)
+
+async def generate_pose_binary(request: PoseRequest, key: str):
+    """Relay the upstream pose bytes in chunks without buffering the whole file, teeing them into the cache"""
+    try:
+        upstream = await open_pose_stream(request.text, request.spoken_language, request.signed_language)
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=503, detail=f"Pose generation failed: {str(e)}")
+
+    headers = {}
+    # The length is only known up front when the body is passed through unencoded
+    if "content-length" in upstream.headers and "content-encoding" not in upstream.headers:
+        headers["Content-Length"] = upstream.headers["content-length"]
+
+    async def relay():
+        writer = None
+        if pose_cache.enabled:
+            try:
+                writer = pose_cache.open_writer(key)
+            except OSError as e:
+                logging.warning(f"Could not store pose in cache: {e}")
+        try:
+            async for chunk in upstream.aiter_bytes(chunk_size=config.POSE_STREAM_CHUNK_BYTES):
+                if writer is not None:
+                    await run_blocking(writer.write, chunk)
+                yield chunk
+        except BaseException:
+            if writer is not None:
+                writer.discard()
+            raise
+        if writer is not None:
+            try:
+                await run_blocking(writer.commit)
+            except OSError as e:
+                logging.warning(f"Could not store pose in cache: {e}")
+
+    return StreamingResponse(
+        relay(),
+        media_type="application/octet-stream",
+        headers=headers,
+        background=BackgroundTask(upstream.aclose),
+    )
@@ -1,24 +1,122 @@
+import asyncio
+import json
 import torch
+from typing import List
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from signwriting_translation.bin import load_sockeye_translator, tokenize_spoken_text, translate
+from config import config
+from services.signwriting_translator import (
+    InvalidLanguageError,
+    build_model_input,
+    model_path_for,
+    translate_inputs,
+    translate_text,
+)
+from services.inference_executor import run_inference
+from services.translation_cache import translation_cache
+from services.text_segmentation import split_sentences
 
 router = APIRouter()
 
 class TextRequest(BaseModel):
     text: str
+    spoken_language: str = "en"
+    signed_language: str = "ase"
+
+class BatchTextRequest(BaseModel):
+    texts: List[str]
+    spoken_language: str = "en"
+    signed_language: str = "ase"
 
 @router.post("/translate_signwriting")
 async def translate_signwriting(request: TextRequest):
     try:
-        model_path = "sign/sockeye-text-to-factored-signwriting"
-        spoken_language = "en"
-        signed_language = "ase"
-
-        translator, tokenizer_path = load_sockeye_translator(model_path)
-        tokenized_text = tokenize_spoken_text(request.text)
-        model_input = f"${spoken_language} ${signed_language} {tokenized_text}"
-        outputs = translate(translator, [model_input])
-        return {"signwriting": outputs[0]}
+        signwriting = await translate_text(request.text, request.spoken_language, request.signed_language)
+        return {"signwriting": signwriting}
+    except InvalidLanguageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
+
+@router.post("/translate_signwriting/batch")
+async def translate_signwriting_batch(request: BatchTextRequest):
+    if len(request.texts) > config.SIGNWRITING_BATCH_MAX_TEXTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many texts: {len(request.texts)} (max {config.SIGNWRITING_BATCH_MAX_TEXTS})."
+        )
+    try:
+        model_path = model_path_for(request.spoken_language, request.signed_language)
+    except InvalidLanguageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        cache_keys = [
+            translation_cache.make_key(
+                text, request.spoken_language, request.signed_language, model_path, config.SIGNWRITING_QUANTIZATION
+            )
+            for text in request.texts
+        ]
+        outputs = await translation_cache.get_many_async(cache_keys)
+
+        # Only translate cache misses, once per distinct key
+        pending = {}
+        for text, key, output in zip(request.texts, cache_keys, outputs):
+            if output is None and key not in pending:
+                pending[key] = build_model_input(text, request.spoken_language, request.signed_language)
+        pending_keys = list(pending)
+        model_inputs = list(pending.values())
+
+        # Chunk into model-sized batches; each chunk is one pass of the shared translator
+        translated = {}
+        chunk_size = config.SIGNWRITING_BATCH_MAX_SIZE
+        try:
+            for start in range(0, len(model_inputs), chunk_size):
+                chunk_outputs = await run_inference(translate_inputs, model_inputs[start:start + chunk_size], model_path)
+                translated.update(zip(pending_keys[start:start + chunk_size], chunk_outputs))
+        finally:
+            # One commit for the whole request, keeping whatever was translated before a failure
+            if translated:
+                await translation_cache.put_many_async(translated.items())
+
+        return {
+            "signwriting": [
+                output if output is not None else translated[key]
+                for key, output in zip(cache_keys, outputs)
+            ]
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
+
+@router.post("/translate_signwriting/stream")
+async def translate_signwriting_stream(request: TextRequest):
+    """
+    Translate text sentence by sentence and stream each result as an NDJSON line
+    as soon as it is ready. Lines carry the sentence index, so they may arrive
+    out of order; a final line with "done": true closes the stream.
+    """
+    try:
+        model_path_for(request.spoken_language, request.signed_language)
+    except InvalidLanguageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    sentences = split_sentences(request.text)
+
+    async def translate_sentence(index: int, sentence: str):
+        try:
+            signwriting = await translate_text(sentence, request.spoken_language, request.signed_language)
+            return {"index": index, "text": sentence, "signwriting": signwriting}
+        except Exception as e:
+            return {"index": index, "text": sentence, "error": f"Translation failed: {str(e)}"}
+
+    async def events():
+        # All sentences are submitted at once so the micro-batcher can group them
+        tasks = [asyncio.ensure_future(translate_sentence(i, s)) for i, s in enumerate(sentences)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield json.dumps(await next_done) + "\n"
+            yield json.dumps({"done": True, "count": len(sentences)}) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
@@ -1,31 +1,79 @@
-import requests
+import httpx
+from typing import List, Optional
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from config import config
+from services.text_simplifier import simplify_batch, simplify_with_source, stream_simplify_events
+from services.sse import sse_event
+from services.readability import is_already_simple
 
 router = APIRouter()
 
 class TextRequest(BaseModel):
     text: str
+    latency_budget_ms: Optional[float] = None
+
+class BatchTextRequest(BaseModel):
+    texts: List[str]
 
 @router.post("/simplify_text")
 async def simplify_text(request: TextRequest):
+    # Already-simple text skips the LLM round trip entirely
+    if is_already_simple(request.text):
+        return {"simplified_text": request.text.strip(), "already_simple": True, "source": "bypass"}
     if not config.GROQ_API_KEY:
         raise HTTPException(status_code=500, detail="Groq API key not configured.")
-    headers = {
-        "Authorization": f"Bearer {config.GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    payload = {
-        "model": "llama3-70b-8192",
-        "messages": [
-            {"role": "user", "content": f"Simplify this text in one short sentence, and only return me the Simplify text nothing it should not contain any bulit points, it should be just a sentence here is the text: {request.text}"}
-        ]
-    }
     try:
-        response = requests.post(config.GROQ_API_URL, json=payload, headers=headers)
-        response.raise_for_status()
-        simplified_text = response.json().get("choices", [{}])[0].get("message", {}).get("content", "")
-        return {"simplified_text": simplified_text}
-    except requests.RequestException as e:
+        simplified_text, source = await simplify_with_source(request.text, request.latency_budget_ms)
+        return {"simplified_text": simplified_text, "already_simple": False, "source": source}
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=503, detail=f"Groq API request failed: {str(e)}")
+
+@router.post("/simplify_text/batch")
+async def simplify_text_batch(request: BatchTextRequest):
+    if len(request.texts) > config.SIMPLIFY_BATCH_MAX_TEXTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many texts: {len(request.texts)} (max {config.SIMPLIFY_BATCH_MAX_TEXTS})."
+        )
+    already_simple = [is_already_simple(text) for text in request.texts]
+    to_simplify = [text for text, simple in zip(request.texts, already_simple) if not simple]
+    if to_simplify and not config.GROQ_API_KEY:
+        raise HTTPException(status_code=500, detail="Groq API key not configured.")
+    try:
+        simplified = iter(await simplify_batch(to_simplify) if to_simplify else [])
+        simplified_texts = [
+            text.strip() if simple else next(simplified)
+            for text, simple in zip(request.texts, already_simple)
+        ]
+        return {"simplified_texts": simplified_texts, "already_simple": already_simple}
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=503, detail=f"Groq API request failed: {str(e)}")
+
+@router.post("/simplify_text/stream")
+async def simplify_text_stream(request: TextRequest):
+    """
+    Stream the simplification over server-sent events: "token" events relay the
+    completion as it arrives, "sentence" events mark each finished sentence, and
+    a final "done" event carries the cleaned sentence.
+    """
+    if is_already_simple(request.text):
+        async def bypass():
+            yield sse_event("done", {"simplified_text": request.text.strip(), "already_simple": True})
+        return StreamingResponse(bypass(), media_type="text/event-stream")
+    if not config.GROQ_API_KEY:
+        raise HTTPException(status_code=500, detail="Groq API key not configured.")
+
+    async def events():
+        try:
+            async for event, data in stream_simplify_events(request.text):
+                yield sse_event(event, data)
+        except httpx.HTTPError as e:
+            yield sse_event("error", {"detail": f"Groq API request failed: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,9 +1,21 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
 import os
+import shutil
 import tempfile
 import logging
-import whisper  # Use OpenAI Whisper
+import numpy as np
+from typing import Optional
 from config import config
+from services.audio_decoding import (
+    SAMPLE_RATE,
+    AudioDecodingError,
+    AudioTooLargeError,
+    decode_stream,
+    read_wav_stream,
+)
+from services.long_form import transcribe_long_form
+from services.whisper_model import clean_transcription, get_whisper_model, transcribe_audio
+from services.inference_executor import run_blocking, run_whisper
 
 router = APIRouter()
 
@@ -12,35 +24,92 @@ PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, "..", ".."))
 
 logging.basicConfig(level=getattr(logging, config.LOG_LEVEL))
 
-@router.post("/transcribe")
-async def transcribe(audio: UploadFile = File(...)):
+def file_size(file) -> int:
+    file.seek(0, os.SEEK_END)
+    size = file.tell()
+    file.seek(0)
+    return size
+
+async def decode_from_temp_file(audio: UploadFile, suffix: str) -> np.ndarray:
+    """Containers that keep their index at the end (e.g. MP4/M4A) cannot be decoded from a pipe"""
     input_filepath = None
     try:
-        # Save the uploaded file to a temporary location
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(audio.filename)[-1]) as input_file:
-            contents = await audio.read()
-            if not contents:
-                raise HTTPException(status_code=400, detail="Empty audio file uploaded.")
-            input_file.write(contents)
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as input_file:
             input_filepath = input_file.name
-        logging.info(f"Uploaded audio saved to temporary file: {input_filepath}")
+            await audio.seek(0)
+            await run_blocking(shutil.copyfileobj, audio.file, input_file, config.TRANSCRIBE_UPLOAD_CHUNK_BYTES)
+        return await decode_stream(None, 0, config.TRANSCRIBE_MAX_DURATION_SECONDS, source=input_filepath)
+    finally:
+        if input_filepath and os.path.exists(input_filepath):
+            os.remove(input_filepath)
 
-        # Load Whisper model using configuration
-        model = whisper.load_model(config.WHISPER_MODEL)
-        result = model.transcribe(input_filepath)
-        transcription = result["text"].strip()
+async def decode_upload(audio: UploadFile) -> np.ndarray:
+    """
+    Decode an upload to 16 kHz float32 samples in fixed-size chunks, so memory
+    is bounded by TRANSCRIBE_MAX_DURATION_SECONDS rather than the file size.
+    Oversized uploads are rejected with 413 as soon as a limit is crossed.
+    """
+    size = await run_blocking(file_size, audio.file)
+    if not size:
+        raise HTTPException(status_code=400, detail="Empty audio file uploaded.")
+    if config.TRANSCRIBE_MAX_UPLOAD_BYTES > 0 and size > config.TRANSCRIBE_MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Audio file too large: {size} bytes (max {config.TRANSCRIBE_MAX_UPLOAD_BYTES})."
+        )
 
-        # Clean transcription to remove timestamps like [00:00:00.000 --> 00:00:04.240]
-        import re
-        cleaned_lines = []
-        for line in transcription.splitlines():
-            cleaned_line = re.sub(r"\[\d{2}:\d{2}:\d{2}\.\d{3} --> \d{2}:\d{2}:\d{2}\.\d{3}\]", "", line).strip()
-            if cleaned_line:
-                cleaned_lines.append(cleaned_line)
-        cleaned_transcription = " ".join(cleaned_lines)
+    suffix = os.path.splitext(audio.filename or "")[-1]
+    try:
+        # 16 kHz PCM WAV is read directly; everything else streams through ffmpeg
+        samples = await run_blocking(read_wav_stream, audio.file, config.TRANSCRIBE_MAX_DURATION_SECONDS)
+        if samples is None:
+            try:
+                samples = await decode_stream(
+                    lambda: audio.read(config.TRANSCRIBE_UPLOAD_CHUNK_BYTES),
+                    config.TRANSCRIBE_MAX_UPLOAD_BYTES,
+                    config.TRANSCRIBE_MAX_DURATION_SECONDS,
+                )
+            except AudioTooLargeError:
+                raise
+            except AudioDecodingError:
+                samples = await decode_from_temp_file(audio, suffix)
+    except AudioTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except AudioDecodingError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not samples.size:
+        raise HTTPException(status_code=400, detail="No audio could be decoded from the upload.")
+    logging.info(f"Decoded {size} bytes of uploaded audio into {samples.size / SAMPLE_RATE:.1f}s of samples")
+    return samples
 
-        return {"text": cleaned_transcription}
+async def transcribe_samples(samples: np.ndarray, language: Optional[str] = None) -> str:
+    """Transcribe 16 kHz float32 samples with the shared Whisper model"""
+    # Decode with the shared Whisper model off the event loop
+    try:
+        await run_whisper(get_whisper_model)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Whisper model not available: {str(e)}")
+    result = await run_whisper(transcribe_audio, samples, language=language)
+    return clean_transcription(result["text"])
 
-    finally:
-        if input_filepath and os.path.exists(input_filepath):
-            os.remove(input_filepath)
+def use_long_form(samples: np.ndarray, long_form: Optional[bool]) -> bool:
+    if config.LONG_FORM_WORKERS <= 0:
+        return False
+    if long_form is not None:
+        return long_form
+    return config.LONG_FORM_MIN_SECONDS > 0 and samples.size / SAMPLE_RATE >= config.LONG_FORM_MIN_SECONDS
+
+@router.post("/transcribe")
+async def transcribe(
+    audio: UploadFile = File(...),
+    long_form: Optional[bool] = Query(None, description="Split at silences and transcribe segments in parallel"),
+    language: Optional[str] = Query(None),
+):
+    samples = await decode_upload(audio)
+    if not use_long_form(samples, long_form):
+        return {"text": await transcribe_samples(samples, language)}
+    try:
+        result = await transcribe_long_form(samples, language)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Long-form transcription failed: {str(e)}")
+    return {"text": clean_transcription(result["text"]), "segments": result["segments"], "language": result["language"]}
@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import Dict, List
 from dotenv import load_dotenv
 import json
 
@@ -18,12 +18,119 @@ class Config:
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
     GROQ_API_URL: str = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
     
+    # Text Simplification
+    SIMPLIFY_CACHE_TTL_SECONDS: float = float(os.getenv("SIMPLIFY_CACHE_TTL_SECONDS", "3600"))
+    SIMPLIFY_CACHE_MAX_ENTRIES: int = int(os.getenv("SIMPLIFY_CACHE_MAX_ENTRIES", "10000"))
+    SIMPLIFY_BATCH_MAX_ITEMS: int = int(os.getenv("SIMPLIFY_BATCH_MAX_ITEMS", "25"))
+    SIMPLIFY_BATCH_MAX_TEXTS: int = int(os.getenv("SIMPLIFY_BATCH_MAX_TEXTS", "2000"))
+    # Upstream calls one batch request may have in flight; the rest wait their turn
+    SIMPLIFY_BATCH_CONCURRENCY: int = int(os.getenv("SIMPLIFY_BATCH_CONCURRENCY", "2"))
+    # 0 disables the latency budget; otherwise the local simplifier answers after this many ms
+    SIMPLIFY_LATENCY_BUDGET_MS: float = float(os.getenv("SIMPLIFY_LATENCY_BUDGET_MS", "0"))
+    SIMPLIFY_HEDGE_ENABLED: bool = os.getenv("SIMPLIFY_HEDGE_ENABLED", "false").lower() == "true"
+    SIMPLIFY_HEDGE_PERCENTILE: float = float(os.getenv("SIMPLIFY_HEDGE_PERCENTILE", "95"))
+    SIMPLIFY_HEDGE_MIN_SAMPLES: int = int(os.getenv("SIMPLIFY_HEDGE_MIN_SAMPLES", "20"))
+    SIMPLIFY_BYPASS_ENABLED: bool = os.getenv("SIMPLIFY_BYPASS_ENABLED", "true").lower() == "true"
+    SIMPLIFY_BYPASS_MAX_SENTENCES: int = int(os.getenv("SIMPLIFY_BYPASS_MAX_SENTENCES", "2"))
+    SIMPLIFY_BYPASS_MAX_WORDS: int = int(os.getenv("SIMPLIFY_BYPASS_MAX_WORDS", "12"))
+    SIMPLIFY_BYPASS_MAX_RARE_WORDS: int = int(os.getenv("SIMPLIFY_BYPASS_MAX_RARE_WORDS", "0"))
+    SIMPLIFY_BYPASS_MIN_READING_EASE: float = float(os.getenv("SIMPLIFY_BYPASS_MIN_READING_EASE", "60"))
+    
     # Pose Generation API
     POSE_API_URL: str = os.getenv("POSE_API_URL", "")
     
+    POSE_STREAM_CHUNK_BYTES: int = int(os.getenv("POSE_STREAM_CHUNK_BYTES", "65536"))
+    # Leave POSE_CACHE_DIR empty to disable the on-disk pose cache
+    POSE_CACHE_DIR: str = os.getenv("POSE_CACHE_DIR", "cache/poses")
+    POSE_WORD_TRANSITION_FRAMES: int = int(os.getenv("POSE_WORD_TRANSITION_FRAMES", "6"))
+    POSE_CACHE_MAX_BYTES: int = int(os.getenv("POSE_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+    
+    # Upstream HTTP Clients
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+    GROQ_TIMEOUT_SECONDS: float = float(os.getenv("GROQ_TIMEOUT_SECONDS", "30"))
+    GROQ_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("GROQ_CONNECT_TIMEOUT_SECONDS", "5"))
+    GROQ_MAX_CONNECTIONS: int = int(os.getenv("GROQ_MAX_CONNECTIONS", "20"))
+    GROQ_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("GROQ_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    POSE_TIMEOUT_SECONDS: float = float(os.getenv("POSE_TIMEOUT_SECONDS", "60"))
+    POSE_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("POSE_CONNECT_TIMEOUT_SECONDS", "5"))
+    POSE_MAX_CONNECTIONS: int = int(os.getenv("POSE_MAX_CONNECTIONS", "20"))
+    POSE_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("POSE_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    
+    # Upstream Guards (rate limiting, retries, circuit breaking); a rate of 0 disables limiting
+    GROQ_RATE_LIMIT_PER_SECOND: float = float(os.getenv("GROQ_RATE_LIMIT_PER_SECOND", "0.5"))
+    GROQ_RATE_LIMIT_BURST: int = int(os.getenv("GROQ_RATE_LIMIT_BURST", "5"))
+    GROQ_MAX_RETRIES: int = int(os.getenv("GROQ_MAX_RETRIES", "2"))
+    POSE_RATE_LIMIT_PER_SECOND: float = float(os.getenv("POSE_RATE_LIMIT_PER_SECOND", "10"))
+    POSE_RATE_LIMIT_BURST: int = int(os.getenv("POSE_RATE_LIMIT_BURST", "20"))
+    POSE_MAX_RETRIES: int = int(os.getenv("POSE_MAX_RETRIES", "2"))
+    UPSTREAM_MAX_QUEUE_WAIT_MS: float = float(os.getenv("UPSTREAM_MAX_QUEUE_WAIT_MS", "5000"))
+    UPSTREAM_BACKOFF_BASE_MS: float = float(os.getenv("UPSTREAM_BACKOFF_BASE_MS", "200"))
+    UPSTREAM_BACKOFF_MAX_MS: float = float(os.getenv("UPSTREAM_BACKOFF_MAX_MS", "5000"))
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_RESET_SECONDS: float = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+    
     # Whisper Model Configuration
     WHISPER_MODEL: str = os.getenv("WHISPER_MODEL", "base")
     WHISPER_DEVICE: str = os.getenv("WHISPER_DEVICE", "cpu")
+    WHISPER_PRELOAD: bool = os.getenv("WHISPER_PRELOAD", "true").lower() == "true"
+    WHISPER_WARMUP: bool = os.getenv("WHISPER_WARMUP", "true").lower() == "true"
+    # Uploads to /transcribe and /pipeline are read and decoded in chunks; 0 disables a limit
+    TRANSCRIBE_UPLOAD_CHUNK_BYTES: int = int(os.getenv("TRANSCRIBE_UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+    TRANSCRIBE_MAX_UPLOAD_BYTES: int = int(os.getenv("TRANSCRIBE_MAX_UPLOAD_BYTES", str(500 * 1024 * 1024)))
+    TRANSCRIBE_MAX_DURATION_SECONDS: float = float(os.getenv("TRANSCRIBE_MAX_DURATION_SECONDS", "7200"))
+    # Long-form mode: split at silences and transcribe segments on a Whisper process pool.
+    # Each worker loads its own Whisper model, so the mode is off (0 workers) unless configured
+    LONG_FORM_WORKERS: int = int(os.getenv("LONG_FORM_WORKERS", "0"))
+    LONG_FORM_THREADS_PER_WORKER: int = int(os.getenv("LONG_FORM_THREADS_PER_WORKER", "2"))
+    # Audio at least this long uses long-form mode unless the request says otherwise; 0 means only on request
+    LONG_FORM_MIN_SECONDS: float = float(os.getenv("LONG_FORM_MIN_SECONDS", "120"))
+    LONG_FORM_SEGMENT_SECONDS: float = float(os.getenv("LONG_FORM_SEGMENT_SECONDS", "30"))
+    LONG_FORM_OVERLAP_SECONDS: float = float(os.getenv("LONG_FORM_OVERLAP_SECONDS", "0.5"))
+    LONG_FORM_VAD_MIN_ENERGY: float = float(os.getenv("LONG_FORM_VAD_MIN_ENERGY", "0.005"))
+    # Live captioning over /ws/transcribe
+    LIVE_TRANSCRIBE_INTERVAL_MS: float = float(os.getenv("LIVE_TRANSCRIBE_INTERVAL_MS", "1000"))
+    LIVE_TRANSCRIBE_MIN_CHUNK_SECONDS: float = float(os.getenv("LIVE_TRANSCRIBE_MIN_CHUNK_SECONDS", "1.0"))
+    LIVE_TRANSCRIBE_WINDOW_SECONDS: float = float(os.getenv("LIVE_TRANSCRIBE_WINDOW_SECONDS", "15"))
+    LIVE_TRANSCRIBE_MAX_BUFFER_SECONDS: float = float(os.getenv("LIVE_TRANSCRIBE_MAX_BUFFER_SECONDS", "30"))
+    LIVE_TRANSCRIBE_PROMPT_CHARS: int = int(os.getenv("LIVE_TRANSCRIBE_PROMPT_CHARS", "200"))
+    
+    # SignWriting Translation Configuration
+    SIGNWRITING_MODEL_PATH: str = os.getenv("SIGNWRITING_MODEL_PATH", "sign/sockeye-text-to-factored-signwriting")
+    SIGNWRITING_PRELOAD: bool = os.getenv("SIGNWRITING_PRELOAD", "true").lower() == "true"
+    SIGNWRITING_BATCH_MAX_SIZE: int = int(os.getenv("SIGNWRITING_BATCH_MAX_SIZE", "16"))
+    SIGNWRITING_BATCH_MAX_WAIT_MS: float = float(os.getenv("SIGNWRITING_BATCH_MAX_WAIT_MS", "5"))
+    SIGNWRITING_BATCH_MAX_TEXTS: int = int(os.getenv("SIGNWRITING_BATCH_MAX_TEXTS", "5000"))
+    SIGNWRITING_CACHE_MAX_BYTES: int = int(os.getenv("SIGNWRITING_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    SIGNWRITING_CACHE_DB_PATH: str = os.getenv("SIGNWRITING_CACHE_DB_PATH", "")
+    # "none" for fp32, or "int8" for dynamic int8 quantization of linear layers (CPU)
+    SIGNWRITING_QUANTIZATION: str = os.getenv("SIGNWRITING_QUANTIZATION", "none").lower()
+    SIGNWRITING_POOL_MEMORY_MB: int = int(os.getenv("SIGNWRITING_POOL_MEMORY_MB", "4096"))
+    
+    @classmethod
+    def get_signwriting_models(cls) -> Dict[str, str]:
+        """Parse the language pair to model path mapping, e.g. {"en-ase": "sign/..."}"""
+        models = os.getenv("SIGNWRITING_MODELS", "{}")
+        try:
+            return json.loads(models)
+        except json.JSONDecodeError:
+            # Fallback to comma-separated pair=path entries
+            return dict(
+                entry.strip().split("=", 1) for entry in models.strip("{}").split(",") if "=" in entry
+            )
+    
+    @classmethod
+    def get_signwriting_pinned_models(cls) -> List[str]:
+        """Model paths that are never evicted from the translator pool"""
+        pinned = os.getenv("SIGNWRITING_PINNED_MODELS", json.dumps([cls.SIGNWRITING_MODEL_PATH]))
+        try:
+            return json.loads(pinned)
+        except json.JSONDecodeError:
+            return [path.strip() for path in pinned.strip('[]').split(',') if path.strip()]
+    
+    # Inference Executors
+    INFERENCE_THREAD_WORKERS: int = int(os.getenv("INFERENCE_THREAD_WORKERS", "2"))
+    INFERENCE_PROCESS_WORKERS: int = int(os.getenv("INFERENCE_PROCESS_WORKERS", "0"))
+    BLOCKING_IO_THREAD_WORKERS: int = int(os.getenv("BLOCKING_IO_THREAD_WORKERS", "16"))
     
     # CORS Configuration
     @classmethod
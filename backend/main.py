@@ -11,18 +11,71 @@ import asyncio
 
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import os
 import tempfile
 import logging
 import asyncio
+from contextlib import asynccontextmanager
 
 from api.signwriting_translation_pytorch import router as signwriting_translation_pytorch_router
 from api.simplify_text import router as simplify_text_router
 from api.pose_generation import router as pose_generation_router
 from api.transcribe import router as transcribe_router
+from api.pipeline import router as pipeline_router
+from api.live_transcription import router as live_transcription_router
 from config import config
+from services.whisper_model import load_whisper_model, is_whisper_ready
+from services.signwriting_translator import load_translator, is_translator_ready, translator_pool
+from services.inference_executor import executor_metrics, shutdown_executors
+from services.translation_cache import translation_cache
+from services.http_clients import start_http_clients, close_http_clients
+from services.text_simplifier import simplifier_metrics
+from services.readability import readability_metrics
+from services.upstream_guard import upstream_metrics
+from services.pose_cache import pose_cache
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await start_http_clients()
+    if config.WHISPER_PRELOAD:
+        try:
+            await asyncio.to_thread(load_whisper_model)
+        except Exception as e:
+            # Keep serving the other endpoints; /transcribe retries the load lazily
+            logging.error(f"Failed to preload Whisper model: {e}")
+    if config.SIGNWRITING_PRELOAD:
+        try:
+            await asyncio.to_thread(load_translator)
+        except Exception as e:
+            logging.error(f"Failed to preload Sockeye translator: {e}")
+    yield
+    await close_http_clients()
+    shutdown_executors()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Uploads with a declared Content-Length over the limit are refused before their body is read
+UPLOAD_PATHS = ("/transcribe", "/pipeline")
+
+
+@app.middleware("http")
+async def reject_oversized_uploads(request, call_next):
+    length = request.headers.get("content-length", "")
+    if (
+        request.url.path in UPLOAD_PATHS
+        and config.TRANSCRIBE_MAX_UPLOAD_BYTES > 0
+        and length.isdigit()
+        and int(length) > config.TRANSCRIBE_MAX_UPLOAD_BYTES
+    ):
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"Upload too large: {length} bytes (max {config.TRANSCRIBE_MAX_UPLOAD_BYTES})."},
+        )
+    return await call_next(request)
 
-app = FastAPI()
 
 app.add_middleware(
     CORSMiddleware,
@@ -38,10 +91,34 @@ PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
 logging.basicConfig(level=getattr(logging, config.LOG_LEVEL))
 
 app.include_router(transcribe_router)
+app.include_router(live_transcription_router)
 
 app.include_router(signwriting_translation_pytorch_router)
 app.include_router(simplify_text_router)
 app.include_router(pose_generation_router)
+app.include_router(pipeline_router)
+
+
+@app.get("/health")
+async def health():
+    return {
+        "status": "ok",
+        "whisper_ready": is_whisper_ready(),
+        "signwriting_ready": is_translator_ready(),
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "executors": executor_metrics(),
+        "signwriting_translators": translator_pool.metrics(),
+        "signwriting_cache": translation_cache.metrics(),
+        "simplify": simplifier_metrics(),
+        "simplify_bypass": readability_metrics(),
+        "upstreams": upstream_metrics(),
+        "pose_cache": pose_cache.metrics(),
+    }
 
 if __name__ == "__main__":
     uvicorn.run(app, host=config.HOST, port=config.PORT, reload=config.DEBUG)
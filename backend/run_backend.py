@@ -1,8 +1,14 @@
 import importlib.util
+import multiprocessing
 import os
 import uvicorn
 from config import config
 
+if __name__ == "__main__":
+    # Frozen (PyInstaller) builds start process pool workers by re-running this
+    # executable; freeze_support hands control to the worker before the app loads
+    multiprocessing.freeze_support()
+
 # Find the path to main.py relative to this script
 main_path = os.path.join(os.path.dirname(__file__), "main.py")
 spec = importlib.util.spec_from_file_location("main", main_path)
@@ -0,0 +1,199 @@
+import asyncio
+import wave
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+class AudioDecodingError(Exception):
+    """The uploaded bytes could not be decoded as audio"""
+
+
+class AudioTooLargeError(AudioDecodingError):
+    """The upload exceeds the configured size or duration limit"""
+
+
+def pcm16_to_float32(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+
+
+class Pcm16Converter:
+    """Turn a stream of little-endian 16-bit PCM bytes into float32 samples, carrying odd bytes over"""
+
+    def __init__(self):
+        self._leftover = b""
+
+    def feed(self, data: bytes) -> np.ndarray:
+        data = self._leftover + data
+        usable = len(data) - len(data) % 2
+        self._leftover = data[usable:]
+        return pcm16_to_float32(data[:usable])
+
+
+class FfmpegStreamDecoder:
+    """Decode a compressed audio stream (webm/Opus, ogg, mp3, ...) to 16 kHz mono float32 with one ffmpeg process
+
+    Bytes go in through `write`; decoded samples come out of `samples()`, which
+    must be consumed concurrently so ffmpeg never blocks on a full stdout pipe.
+    """
+
+    def __init__(self, input_format: Optional[str] = None, read_size: int = 32768, source: str = "pipe:0"):
+        self.input_format = input_format
+        self.read_size = read_size
+        # A file path instead of stdin for containers that need seeking
+        self.source = source
+        self._process = None
+
+    async def start(self):
+        command = ["ffmpeg", "-nostdin", "-loglevel", "error", "-threads", "0"]
+        if self.input_format:
+            command += ["-f", self.input_format]
+        command += ["-i", self.source, "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"]
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                *command,
+                stdin=asyncio.subprocess.PIPE if self.source == "pipe:0" else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except FileNotFoundError:
+            raise AudioDecodingError("ffmpeg is not installed")
+        return self
+
+    async def write(self, data: bytes):
+        self._process.stdin.write(data)
+        await self._process.stdin.drain()
+
+    async def close_input(self):
+        if not self._process.stdin.is_closing():
+            self._process.stdin.close()
+            try:
+                await self._process.stdin.wait_closed()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    async def samples(self) -> AsyncIterator[np.ndarray]:
+        converter = Pcm16Converter()
+        while True:
+            data = await self._process.stdout.read(self.read_size)
+            if not data:
+                break
+            yield converter.feed(data)
+
+    async def wait(self) -> int:
+        return await self._process.wait()
+
+    async def aclose(self):
+        """Stop ffmpeg; safe to call more than once"""
+        if self._process is None:
+            return
+        if self._process.returncode is None:
+            try:
+                self._process.kill()
+            except ProcessLookupError:
+                pass
+        await self._process.wait()
+
+
+class SampleAccumulator:
+    """Collect decoded chunks into one growing buffer, failing as soon as the audio passes `max_seconds`
+
+    Chunks are copied straight into the buffer, which grows in place, so the
+    decoded audio is never held twice. `expected_samples` (e.g. from a WAV
+    header) sizes the buffer up front.
+    """
+
+    def __init__(self, max_seconds: float, expected_samples: int = 0):
+        self.max_samples = int(max_seconds * SAMPLE_RATE) if max_seconds > 0 else None
+        self._buffer = np.empty(self._capped(expected_samples or SAMPLE_RATE * 30), dtype=np.float32)
+        self.count = 0
+
+    def _capped(self, samples: int) -> int:
+        return min(samples, self.max_samples) if self.max_samples is not None else samples
+
+    def add(self, samples: np.ndarray):
+        end = self.count + samples.size
+        if self.max_samples is not None and end > self.max_samples:
+            raise AudioTooLargeError(f"Audio is longer than the {self.max_samples // SAMPLE_RATE}s limit")
+        if end > self._buffer.size:
+            # No views of the buffer exist yet, so it can be reallocated in place
+            self._buffer.resize(max(end, self._capped(self._buffer.size * 3 // 2)), refcheck=False)
+        self._buffer[self.count:end] = samples
+        self.count = end
+
+    def result(self) -> np.ndarray:
+        self._buffer.resize(self.count, refcheck=False)
+        return self._buffer
+
+
+def read_wav_stream(file, max_seconds: float, chunk_frames: int = SAMPLE_RATE * 30) -> Optional[np.ndarray]:
+    """Decode a 16 kHz 16-bit PCM WAV from a seekable file in chunks (blocking)
+
+    Returns None, with the file rewound, when it is not such a WAV.
+    """
+    try:
+        # Explicit mode: uploads are SpooledTemporaryFiles opened "w+b", which wave.open would reject
+        wav = wave.open(file, "rb")
+    except (wave.Error, EOFError):
+        file.seek(0)
+        return None
+    with wav:
+        if wav.getsampwidth() != 2 or wav.getframerate() != SAMPLE_RATE or wav.getcomptype() != "NONE":
+            file.seek(0)
+            return None
+        channels = wav.getnchannels()
+        samples = SampleAccumulator(max_seconds, wav.getnframes())
+        while True:
+            frames = wav.readframes(chunk_frames)
+            if not frames:
+                break
+            chunk = pcm16_to_float32(frames[:len(frames) - len(frames) % (2 * channels)])
+            if channels > 1:
+                chunk = chunk.reshape(-1, channels).mean(axis=1)
+            samples.add(chunk)
+    return samples.result()
+
+
+async def decode_stream(read_chunk: Optional[Callable[[], Awaitable[bytes]]], max_bytes: int, max_seconds: float,
+                        source: str = "pipe:0") -> np.ndarray:
+    """Decode audio through ffmpeg while it is still being read, with bounded limits
+
+    `read_chunk` returns the next chunk of the input (b"" at the end); it is not
+    called when `source` is a file path. Input is fed and output collected
+    concurrently, and the first chunk past `max_bytes` or decoded sample past
+    `max_seconds` aborts the decode with AudioTooLargeError.
+    """
+    decoder = await FfmpegStreamDecoder(source=source).start()
+    samples = SampleAccumulator(max_seconds)
+
+    async def feed():
+        total = 0
+        try:
+            while True:
+                chunk = await read_chunk()
+                if not chunk:
+                    break
+                total += len(chunk)
+                if max_bytes > 0 and total > max_bytes:
+                    raise AudioTooLargeError(f"Upload is larger than the {max_bytes} byte limit")
+                await decoder.write(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # ffmpeg gave up on the input; its exit status reports why
+        finally:
+            await decoder.close_input()
+
+    feeder = asyncio.ensure_future(feed()) if source == "pipe:0" else None
+    try:
+        async for chunk in decoder.samples():
+            samples.add(chunk)
+        if feeder is not None:
+            await feeder
+        if await decoder.wait() != 0:
+            raise AudioDecodingError("Failed to decode audio")
+        return samples.result()
+    finally:
+        if feeder is not None and not feeder.done():
+            feeder.cancel()
+        await decoder.aclose()
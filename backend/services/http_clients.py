@@ -0,0 +1,69 @@
+import logging
+
+import httpx
+
+from config import config
+
+# One pooled AsyncClient per upstream, created in the app lifespan so that
+# keep-alive connections (and TLS sessions) are reused across requests.
+_clients = {}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _upstream_settings():
+    return {
+        "groq": {
+            "timeout": httpx.Timeout(config.GROQ_TIMEOUT_SECONDS, connect=config.GROQ_CONNECT_TIMEOUT_SECONDS),
+            "limits": httpx.Limits(
+                max_connections=config.GROQ_MAX_CONNECTIONS,
+                max_keepalive_connections=config.GROQ_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        },
+        "pose": {
+            "timeout": httpx.Timeout(config.POSE_TIMEOUT_SECONDS, connect=config.POSE_CONNECT_TIMEOUT_SECONDS),
+            "limits": httpx.Limits(
+                max_connections=config.POSE_MAX_CONNECTIONS,
+                max_keepalive_connections=config.POSE_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        },
+    }
+
+
+def _create_client(name: str) -> httpx.AsyncClient:
+    settings = _upstream_settings()[name]
+    http2 = config.HTTP2_ENABLED and _http2_available()
+    if config.HTTP2_ENABLED and not http2:
+        logging.warning(f"HTTP/2 requested for '{name}' upstream but the h2 package is not installed")
+    # follow_redirects matches the behaviour of the requests calls this replaced
+    return httpx.AsyncClient(
+        timeout=settings["timeout"], limits=settings["limits"], http2=http2, follow_redirects=True
+    )
+
+
+async def start_http_clients():
+    for name in _upstream_settings():
+        if name not in _clients:
+            _clients[name] = _create_client(name)
+    logging.info(f"Started pooled HTTP clients: {', '.join(_clients)}")
+
+
+async def close_http_clients():
+    while _clients:
+        _, client = _clients.popitem()
+        await client.aclose()
+
+
+def get_http_client(name: str) -> httpx.AsyncClient:
+    """Return the pooled client for an upstream ("groq" or "pose")"""
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        # Used outside the app lifespan (scripts, tests): create on demand
+        client = _clients[name] = _create_client(name)
+    return client
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from config import config
+
+
+class TrackedExecutor:
+    """Wraps a concurrent.futures executor and counts queued and running jobs"""
+
+    def __init__(self, name: str, executor):
+        self.name = name
+        self.executor = executor
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _run(self, fn, args, kwargs):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    def _done(self, future):
+        with self._lock:
+            if isinstance(self.executor, ProcessPoolExecutor) or future.cancelled():
+                # Process workers cannot update our counters, and a job cancelled before
+                # it started never reached `_run`, so either way it is still counted as queued
+                self.queued -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    async def submit(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self.queued += 1
+        if isinstance(self.executor, ProcessPoolExecutor):
+            future = self.executor.submit(fn, *args, **kwargs)
+        else:
+            future = self.executor.submit(self._run, fn, args, kwargs)
+        future.add_done_callback(self._done)
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.executor._max_workers,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Torch releases the GIL while running kernels, so a small thread pool is enough
+# to overlap Whisper and Sockeye work without oversubscribing the CPU.
+_inference = TrackedExecutor(
+    "inference",
+    ThreadPoolExecutor(max_workers=config.INFERENCE_THREAD_WORKERS, thread_name_prefix="inference"),
+)
+# Whisper calls are serialized by `transcribe_lock`, so they get a single thread of
+# their own instead of parking an inference thread that Sockeye could use.
+_whisper = TrackedExecutor(
+    "whisper",
+    ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper"),
+)
+# Blocking I/O (synchronous HTTP calls, file access) gets its own wider pool so it
+# never waits behind model inference.
+_blocking = TrackedExecutor(
+    "blocking_io",
+    ThreadPoolExecutor(max_workers=config.BLOCKING_IO_THREAD_WORKERS, thread_name_prefix="blocking-io"),
+)
+_process = None
+if config.INFERENCE_PROCESS_WORKERS > 0:
+    # Spawned rather than forked: forking after torch has started its threads can deadlock the children
+    _process = TrackedExecutor("process", ProcessPoolExecutor(
+        max_workers=config.INFERENCE_PROCESS_WORKERS, mp_context=multiprocessing.get_context("spawn")
+    ))
+# Executors created elsewhere (e.g. lazily by a service) that should show up in metrics and be shut down
+_registered = []
+
+
+async def run_inference(fn, *args, **kwargs):
+    """Run CPU-bound model work on the inference thread pool"""
+    return await _inference.submit(fn, *args, **kwargs)
+
+
+async def run_whisper(fn, *args, **kwargs):
+    """Run Whisper loading or decoding on its dedicated thread"""
+    return await _whisper.submit(fn, *args, **kwargs)
+
+
+async def run_blocking(fn, *args, **kwargs):
+    """Run blocking I/O on the I/O thread pool"""
+    return await _blocking.submit(fn, *args, **kwargs)
+
+
+async def run_in_process(fn, *args, **kwargs):
+    """Run picklable work on the process pool, or the inference threads when it is disabled"""
+    if _process is None:
+        return await _inference.submit(fn, *args, **kwargs)
+    return await _process.submit(fn, *args, **kwargs)
+
+
+def register_executor(executor: TrackedExecutor) -> TrackedExecutor:
+    _registered.append(executor)
+    return executor
+
+
+def unregister_executor(executor: TrackedExecutor):
+    if executor in _registered:
+        _registered.remove(executor)
+
+
+def executor_metrics() -> dict:
+    executors = [_inference, _whisper, _blocking] + ([_process] if _process else []) + _registered
+    return {executor.name: executor.metrics() for executor in executors}
+
+
+def shutdown_executors():
+    for executor in [_inference, _whisper, _blocking, _process] + _registered:
+        if executor is not None:
+            executor.shutdown()
+    logging.info("Inference executors shut down")
@@ -0,0 +1,34 @@
+import threading
+from collections import deque
+from typing import Optional
+
+
+class LatencyTracker:
+    """Keeps the most recent latency samples (seconds) for percentile estimates"""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percent: float, min_samples: int = 1) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < max(1, min_samples):
+            return None
+        index = min(len(samples) - 1, int(round(percent / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def metrics(self) -> dict:
+        p50, p95, p99 = (self.percentile(p) for p in (50, 95, 99))
+        with self._lock:
+            count = len(self._samples)
+        return {
+            "samples": count,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "p99_ms": round(p99 * 1000, 1) if p99 is not None else None,
+        }
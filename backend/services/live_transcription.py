@@ -0,0 +1,140 @@
+import re
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from config import config
+from services.audio_decoding import SAMPLE_RATE
+from services.whisper_model import transcribe_audio
+
+# (start, end, text) with times in seconds since the session started
+Word = Tuple[float, float, str]
+
+_PUNCTUATION = re.compile(r"[^\w']+")
+
+
+def _normalize(word: str) -> str:
+    return _PUNCTUATION.sub("", word.lower())
+
+
+def words_text(words: List[Word]) -> str:
+    return " ".join(word for _, _, word in words)
+
+
+class LiveTranscriptionSession:
+    """Incremental Whisper decoding over a rolling audio buffer
+
+    Each `step` re-decodes the unconfirmed tail of the audio and commits the
+    words that two consecutive decodes agree on (LocalAgreement-2), so partial
+    results only grow once they are stable. Committed audio is trimmed from the
+    buffer to keep the window bounded. The detected language and a prompt built
+    from the committed text are kept as the session's warm decoder state.
+    """
+
+    def __init__(self, language: Optional[str] = None):
+        self.language = language
+        self.committed: List[Word] = []
+        self.hypothesis: List[Word] = []
+        self._audio = np.zeros(0, dtype=np.float32)
+        self._buffer_start = 0.0
+        self._decoded_samples = 0
+        # Audio arrives on the event loop while `step` runs on an inference thread
+        self._lock = threading.Lock()
+
+    def add_audio(self, samples: np.ndarray):
+        if samples.size:
+            with self._lock:
+                self._audio = np.concatenate([self._audio, samples])
+
+    @property
+    def buffered_seconds(self) -> float:
+        return len(self._audio) / SAMPLE_RATE
+
+    def has_new_audio(self) -> bool:
+        with self._lock:
+            pending = len(self._audio) - self._decoded_samples
+            return pending > 0 and len(self._audio) >= config.LIVE_TRANSCRIBE_MIN_CHUNK_SECONDS * SAMPLE_RATE
+
+    def prompt(self) -> Optional[str]:
+        text = words_text(self.committed)[-config.LIVE_TRANSCRIBE_PROMPT_CHARS:]
+        return text or None
+
+    def step(self) -> Tuple[List[Word], List[Word]]:
+        """Decode the buffer (blocking); returns (newly committed words, tentative words)"""
+        with self._lock:
+            audio = self._audio
+            buffer_start = self._buffer_start
+        if not audio.size:
+            return [], self.hypothesis
+
+        result = transcribe_audio(
+            audio,
+            language=self.language,
+            initial_prompt=self.prompt(),
+            word_timestamps=True,
+            condition_on_previous_text=False,
+            temperature=0.0,
+        )
+        if self.language is None:
+            self.language = result.get("language")
+
+        committed_end = self.committed[-1][1] if self.committed else 0.0
+        words = [
+            (buffer_start + word["start"], buffer_start + word["end"], word["word"].strip())
+            for segment in result.get("segments", [])
+            for word in segment.get("words", [])
+        ]
+        words = [word for word in words if word[2] and word[0] >= committed_end - 0.1]
+        words = self._drop_repeated_prefix(words)
+
+        agreed = 0
+        while (agreed < min(len(words), len(self.hypothesis))
+               and _normalize(words[agreed][2]) == _normalize(self.hypothesis[agreed][2])):
+            agreed += 1
+        new_words = words[:agreed]
+        self.committed.extend(new_words)
+        self.hypothesis = words[agreed:]
+
+        with self._lock:
+            self._decoded_samples = len(audio)
+        new_words.extend(self._trim())
+        return new_words, self.hypothesis
+
+    def finish(self) -> List[Word]:
+        """Commit whatever is still tentative at the end of the session"""
+        new_words, self.hypothesis = self.hypothesis, []
+        self.committed.extend(new_words)
+        return new_words
+
+    def _drop_repeated_prefix(self, words: List[Word]) -> List[Word]:
+        # Whisper often repeats the last committed words at the start of the window
+        if not self.committed or not words or words[0][0] - self.committed[-1][1] > 1.0:
+            return words
+        for n in range(min(5, len(self.committed), len(words)), 0, -1):
+            tail = [_normalize(word) for _, _, word in self.committed[-n:]]
+            if tail == [_normalize(word) for _, _, word in words[:n]]:
+                return words[n:]
+        return words
+
+    def _trim(self) -> List[Word]:
+        """Drop committed audio once the buffer outgrows the window; returns words force-committed to do so"""
+        forced = []
+        if self.buffered_seconds <= config.LIVE_TRANSCRIBE_WINDOW_SECONDS:
+            return forced
+        cut = self.committed[-1][1] if self.committed else self._buffer_start
+        if cut <= self._buffer_start and self.buffered_seconds > config.LIVE_TRANSCRIBE_MAX_BUFFER_SECONDS:
+            # Nothing has stabilized for too long; commit the hypothesis to guarantee progress
+            forced = self.finish()
+            if forced:
+                cut = forced[-1][1]
+            if cut <= self._buffer_start:
+                # Nothing to commit (e.g. silence after the last word); keep only the latest window
+                cut = self._buffer_start + self.buffered_seconds - config.LIVE_TRANSCRIBE_WINDOW_SECONDS
+        with self._lock:
+            drop = int((cut - self._buffer_start) * SAMPLE_RATE)
+            if drop > 0:
+                self._audio = self._audio[drop:]
+                self._buffer_start += drop / SAMPLE_RATE
+                self._decoded_samples = max(0, self._decoded_samples - drop)
+        return forced
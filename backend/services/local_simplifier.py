@@ -0,0 +1,73 @@
+import re
+
+from services.text_segmentation import split_sentences
+
+# Wordy phrases and their plain replacements, applied before filler removal
+_REPLACEMENTS = [
+    (r"\bin order to\b", "to"),
+    (r"\bdue to the fact that\b", "because"),
+    (r"\bowing to the fact that\b", "because"),
+    (r"\bin spite of the fact that\b", "although"),
+    (r"\bat this point in time\b", "now"),
+    (r"\bat the present time\b", "now"),
+    (r"\bin the event that\b", "if"),
+    (r"\bprior to\b", "before"),
+    (r"\bsubsequent to\b", "after"),
+    (r"\bwith regard to\b", "about"),
+    (r"\bwith respect to\b", "about"),
+    (r"\bin the near future\b", "soon"),
+    (r"\ba large number of\b", "many"),
+    (r"\bthe majority of\b", "most"),
+    (r"\bis able to\b", "can"),
+    (r"\bare able to\b", "can"),
+    (r"\bhas the ability to\b", "can"),
+    (r"\butilize\b", "use"),
+    (r"\bcommence\b", "start"),
+    (r"\bterminate\b", "end"),
+    (r"\bassistance\b", "help"),
+    (r"\bapproximately\b", "about"),
+]
+
+# Spoken disfluencies only; words like "just" or "very" often carry meaning ("Is it just me?")
+_FILLERS = [
+    r"\b(?:um+|uh+|erm|er)\b,?\s*", r"\byou know,\s*", r"\bI mean,\s*", r"^(?:so|well|like),\s+",
+]
+
+_RELATIVE = r"(?:which|who|whom|whose|where|although|though|while|whereas)"
+# ", which was scheduled for noon," in the middle of a sentence
+_INNER_CLAUSE = re.compile(rf",\s*{_RELATIVE}\b[^,]*,", re.IGNORECASE)
+# ", which is very cheap there" at the end of a sentence
+_TRAILING_CLAUSE = re.compile(rf",\s*{_RELATIVE}\b.*$", re.IGNORECASE)
+_PARENTHETICAL = re.compile(r"\s*(?:\([^)]*\)|—[^—]*—|\s-\s[^-]*\s-\s)")
+
+
+def simplify_locally(text: str) -> str:
+    """Deterministic rule-based simplification used when the LLM is too slow
+
+    Keeps the first sentence, rewrites wordy phrases, removes filler words and
+    drops parenthetical and relative clauses, always returning one sentence.
+    """
+    sentences = split_sentences(" ".join(text.split()))
+    if not sentences:
+        return ""
+    sentence = sentences[0]
+    ending = sentence[-1] if sentence[-1] in ".!?" else "."
+
+    for pattern, replacement in _REPLACEMENTS:
+        sentence = re.sub(pattern, replacement, sentence, flags=re.IGNORECASE)
+    for pattern in _FILLERS:
+        sentence = re.sub(pattern, "", sentence, flags=re.IGNORECASE)
+
+    main_clause = _PARENTHETICAL.sub(" ", sentence)
+    main_clause = _INNER_CLAUSE.sub("", main_clause)
+    main_clause = _TRAILING_CLAUSE.sub("", main_clause)
+    main_clause = main_clause.split(";")[0]
+    # Do not cut so aggressively that only a fragment remains
+    if len(main_clause.split()) >= 3:
+        sentence = main_clause
+
+    sentence = " ".join(sentence.split()).strip(" ,;:-")
+    sentence = sentence.rstrip(".!?")
+    if not sentence:
+        return text.strip()
+    return sentence[0].upper() + sentence[1:] + ending
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from config import config
+from services.audio_decoding import SAMPLE_RATE
+from services.inference_executor import TrackedExecutor, register_executor, unregister_executor
+
+_FRAME = int(SAMPLE_RATE * 0.03)
+# Pauses are scored over ~0.3 s so cuts prefer real gaps over a single quiet frame
+_SMOOTHING_FRAMES = 10
+_MIN_VOICED_FRAMES = 10
+
+_executor = None
+_executor_lock = threading.Lock()
+# Set in each pool worker by `_init_worker`
+_worker_model = None
+
+
+def frame_energies(samples: np.ndarray) -> np.ndarray:
+    """RMS energy of consecutive 30 ms frames"""
+    count = len(samples) // _FRAME
+    frames = samples[:count * _FRAME].reshape(count, _FRAME)
+    return np.sqrt(np.mean(frames ** 2, axis=1))
+
+
+def plan_segments(samples: np.ndarray, max_seconds: float = None) -> List[Tuple[int, int, bool]]:
+    """Split audio at silences into segments of at most `max_seconds`
+
+    Energy-based VAD: each cut is placed at the quietest point (smoothed frame
+    energy) between half and all of the maximum length. Returns
+    (start_sample, end_sample, voiced) tuples covering the whole input, where
+    `voiced` is False for segments that contain no speech-level energy.
+    """
+    max_seconds = max_seconds or config.LONG_FORM_SEGMENT_SECONDS
+    energy = frame_energies(samples)
+    if not energy.size:
+        return [(0, len(samples), bool(len(samples)))]
+    # Relative to the noise floor, but never above the median so steady loud audio still counts as voiced
+    noise_floor, median = np.percentile(energy, [10, 50])
+    threshold = max(config.LONG_FORM_VAD_MIN_ENERGY, min(2 * float(noise_floor), float(median)))
+    smoothed = np.convolve(energy, np.ones(_SMOOTHING_FRAMES) / _SMOOTHING_FRAMES, mode="same")
+
+    max_frames = max(1, int(max_seconds * SAMPLE_RATE / _FRAME))
+    cuts = [0]
+    while len(energy) - cuts[-1] > max_frames:
+        low = cuts[-1] + max_frames // 2
+        high = cuts[-1] + max_frames
+        cuts.append(low + int(np.argmin(smoothed[low:high])))
+    cuts.append(len(energy))
+
+    segments = []
+    for start, end in zip(cuts, cuts[1:]):
+        voiced = int(np.count_nonzero(energy[start:end] >= threshold)) >= _MIN_VOICED_FRAMES
+        segments.append((start * _FRAME, end * _FRAME, voiced))
+    # The trailing partial frame belongs to the last segment
+    start, _, voiced = segments[-1]
+    segments[-1] = (start, len(samples), voiced)
+    return segments
+
+
+def _init_worker(model_name: str, device: str, threads: int):
+    """Process pool initializer: every worker loads its own Whisper model once"""
+    global _worker_model
+    import torch
+    import whisper
+
+    torch.set_num_threads(max(1, threads))
+    _worker_model = whisper.load_model(model_name, device=device)
+
+
+def transcribe_segment(samples: np.ndarray, offset: float, language: Optional[str] = None) -> dict:
+    """Transcribe one segment in a pool worker; timestamps are shifted by `offset` seconds"""
+    result = _worker_model.transcribe(
+        samples, language=language, fp16=config.WHISPER_DEVICE != "cpu", condition_on_previous_text=False
+    )
+    return {
+        "language": result.get("language"),
+        "segments": [
+            {"start": offset + segment["start"], "end": offset + segment["end"], "text": segment["text"].strip()}
+            for segment in result.get("segments", [])
+            if segment["text"].strip()
+        ],
+    }
+
+
+def get_long_form_executor() -> TrackedExecutor:
+    """The long-form process pool, started on first use and restarted if it broke"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None and _executor.executor._broken:
+            _discard_executor()
+        if _executor is None:
+            # Spawned rather than forked so workers do not inherit torch threads from the server
+            pool = ProcessPoolExecutor(
+                max_workers=config.LONG_FORM_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(config.WHISPER_MODEL, config.WHISPER_DEVICE, config.LONG_FORM_THREADS_PER_WORKER),
+            )
+            _executor = register_executor(TrackedExecutor("long_form", pool))
+            logging.info(f"Started long-form transcription pool with {config.LONG_FORM_WORKERS} workers")
+        return _executor
+
+
+def _discard_executor():
+    global _executor
+    logging.warning("Long-form transcription pool is broken; it will be restarted")
+    unregister_executor(_executor)
+    _executor.shutdown()
+    _executor = None
+
+
+def reset_long_form_executor(broken: TrackedExecutor):
+    """Drop a pool that raised BrokenProcessPool so the next request starts a fresh one"""
+    with _executor_lock:
+        if _executor is broken:
+            _discard_executor()
+
+
+def stitch_segments(bounds: List[Tuple[int, int]], results: List[dict]) -> List[dict]:
+    """Merge per-segment results, dropping text decoded twice in the overlaps
+
+    Each segment owns the audio between its cut points; a transcribed segment
+    is kept only by the segment that owns its midpoint, and an exact repeat of
+    the previous kept text right at a boundary is dropped.
+    """
+    stitched = []
+    for (start, end), result in zip(bounds, results):
+        own_start, own_end = start / SAMPLE_RATE, end / SAMPLE_RATE
+        for segment in result["segments"]:
+            midpoint = (segment["start"] + segment["end"]) / 2
+            if not own_start <= midpoint < own_end:
+                continue
+            if stitched and segment["text"] == stitched[-1]["text"] and segment["start"] - stitched[-1]["end"] < 1.0:
+                continue
+            stitched.append({
+                "start": round(max(segment["start"], own_start), 3),
+                "end": round(min(segment["end"], own_end), 3),
+                "text": segment["text"],
+            })
+    return stitched
+
+
+async def transcribe_long_form(samples: np.ndarray, language: Optional[str] = None) -> dict:
+    """Transcribe long audio by decoding its VAD segments in parallel across the process pool"""
+    executor = get_long_form_executor()
+    pad = int(config.LONG_FORM_OVERLAP_SECONDS * SAMPLE_RATE)
+    bounds = []
+    jobs = []
+    for start, end, voiced in plan_segments(samples):
+        if not voiced:
+            continue
+        padded_start = max(0, start - pad)
+        segment = np.ascontiguousarray(samples[padded_start:min(len(samples), end + pad)])
+        bounds.append((start, end))
+        jobs.append(executor.submit(transcribe_segment, segment, padded_start / SAMPLE_RATE, language))
+    try:
+        results = await asyncio.gather(*jobs)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed while loading its model); never keep serving from a dead pool
+        reset_long_form_executor(executor)
+        raise
+
+    segments = stitch_segments(bounds, results)
+    languages = Counter(result["language"] for result in results if result["language"])
+    return {
+        "text": " ".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "language": language or (languages.most_common(1)[0][0] if languages else None),
+    }
@@ -0,0 +1,35 @@
+import os
+import resource
+import sys
+
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process in bytes"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # No procfs (macOS): fall back to the peak RSS, reported in bytes on macOS and KiB elsewhere
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _state_size_bytes(value) -> int:
+    if hasattr(value, "element_size") and hasattr(value, "numel"):
+        return value.numel() * value.element_size()
+    if isinstance(value, (tuple, list)):
+        return sum(_state_size_bytes(item) for item in value)
+    return 0
+
+
+def module_size_bytes(modules) -> int:
+    """Total size of the weights of the given torch modules
+
+    Walks the state dict rather than `parameters()` so that the packed weights
+    of dynamically quantized layers are counted too.
+    """
+    return sum(_state_size_bytes(value) for module in modules for value in module.state_dict().values())
+
+
+def format_mb(num_bytes: int) -> str:
+    return f"{num_bytes / (1024 * 1024):.1f} MB"
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+
+
+class BatcherClosed(RuntimeError):
+    """Raised to submitters of a batcher that has been closed"""
+
+
+class MicroBatcher:
+    """Collects concurrent submissions and runs them through one batched call
+
+    Items wait at most `max_wait_ms` for companions, or until `max_batch_size`
+    items are collected, then `batch_fn(items)` is awaited once and each
+    submitter receives the result at its own position.
+    """
+
+    def __init__(self, name: str, batch_fn, max_batch_size: int, max_wait_ms: float):
+        self.name = name
+        self._batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue = None
+        self._worker = None
+        self.closed = False
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, item):
+        if self.closed:
+            raise BatcherClosed(f"{self.name} batcher was closed")
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            # Drain whatever is already waiting before sleeping on the deadline
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def close(self):
+        """Stop the worker for good; safe to call from any thread"""
+        self.closed = True
+        worker = self._worker
+        if worker is not None and not worker.done():
+            worker.get_loop().call_soon_threadsafe(worker.cancel)
+
+    def _fail_pending(self, batch, error: Exception):
+        while self._queue is not None and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _run(self):
+        batch = []
+        try:
+            while True:
+                batch = []
+                batch = await self._collect()
+                await self._run_batch(batch)
+        except asyncio.CancelledError:
+            self._fail_pending(batch, BatcherClosed(f"{self.name} batcher was closed"))
+            raise
+
+    async def _run_batch(self, batch):
+        # Submitters that gave up (client disconnect) do not need a slot
+        batch = [(item, future) for item, future in batch if not future.cancelled()]
+        if not batch:
+            return
+
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        try:
+            results = await self._batch_fn([item for item, _ in batch])
+        except Exception as e:
+            logging.error(f"{self.name} batch of {len(batch)} failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def metrics(self) -> dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self.batches,
+            "items": self.items,
+            "largest_batch": self.largest_batch,
+            "average_batch": round(self.items / self.batches, 2) if self.batches else 0,
+        }
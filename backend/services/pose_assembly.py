@@ -0,0 +1,76 @@
+import asyncio
+import io
+import logging
+import re
+from typing import List
+
+import numpy as np
+from pose_format import Pose
+from pose_format.numpy import NumPyPoseBody
+
+from config import config
+from services.inference_executor import run_inference
+from services.pose_service import get_or_fetch_pose
+
+_WORD = re.compile(r"[\w']+")
+
+
+def split_glosses(text: str) -> List[str]:
+    """Split text into lowercase words, used as per-word pose requests"""
+    return _WORD.findall(text.lower())
+
+
+def _transition(previous: np.ma.MaskedArray, following: np.ma.MaskedArray, frames: int) -> np.ma.MaskedArray:
+    """Linearly interpolate `frames` frames between the last frame of one clip and the first of the next"""
+    weights = np.linspace(0, 1, frames + 2, dtype=np.float32)[1:-1].reshape(-1, 1, 1, 1)
+    start, end = previous[-1:], following[:1]
+    return start + (end - start) * weights
+
+
+def assemble_poses(clips: List[bytes], transition_frames: int) -> bytes:
+    """Concatenate binary pose clips into one pose, with interpolated transitions between clips"""
+    poses = [Pose.read(clip) for clip in clips]
+    poses = [pose for pose in poses if pose.body.data.shape[0] > 0]
+    if not poses:
+        raise ValueError("No pose frames to assemble")
+
+    first = poses[0]
+    data_parts, confidence_parts = [], []
+    previous = None
+    for pose in poses:
+        data, confidence = pose.body.data, pose.body.confidence
+        if data.shape[1:] != first.body.data.shape[1:]:
+            logging.warning(f"Skipping pose clip with shape {data.shape[1:]}, expected {first.body.data.shape[1:]}")
+            continue
+        if previous is not None and transition_frames > 0:
+            previous_data, previous_confidence = previous
+            data_parts.append(_transition(previous_data, data, transition_frames))
+            confidence_parts.append(
+                np.repeat(np.minimum(previous_confidence[-1:], confidence[:1]), transition_frames, axis=0)
+            )
+        data_parts.append(data)
+        confidence_parts.append(confidence)
+        previous = (data, confidence)
+
+    body = NumPyPoseBody(
+        fps=first.body.fps,
+        data=np.ma.concatenate(data_parts, axis=0),
+        confidence=np.concatenate(confidence_parts, axis=0),
+    )
+    buffer = io.BytesIO()
+    Pose(first.header, body).write(buffer)
+    return buffer.getvalue()
+
+
+async def assemble_sentence_pose(text: str, spoken_language: str, signed_language: str) -> bytes:
+    """Build a sentence pose from cached (or newly fetched) per-word clips"""
+    words = split_glosses(text)
+    if not words:
+        raise ValueError("Text contains no words")
+    # Each distinct word is fetched once, concurrently; only unseen words reach the upstream
+    distinct = list(dict.fromkeys(words))
+    clips = await asyncio.gather(*[get_or_fetch_pose(word, spoken_language, signed_language) for word in distinct])
+    clip_by_word = dict(zip(distinct, clips))
+    return await run_inference(
+        assemble_poses, [clip_by_word[word] for word in words], config.POSE_WORD_TRANSITION_FRAMES
+    )
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from config import config
+from services.text_segmentation import normalize_text
+
+
+def pose_cache_key(text: str, spoken_language: str, signed_language: str, variant: str = "") -> str:
+    """Content address of a pose request: sha256 of the normalized (text, spoken, signed) triple
+
+    `variant` distinguishes derived poses (e.g. assembled from word clips) of the same request.
+    """
+    fields = [normalize_text(text), spoken_language, signed_language] + ([variant] if variant else [])
+    payload = json.dumps(fields, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CachedPose:
+    def __init__(self, path: str, size: int, etag: str):
+        self.path = path
+        self.size = size
+        self.etag = etag
+
+
+class PoseCache:
+    """Disk store of binary pose files with an in-memory LRU index
+
+    Files live at `<directory>/<key[:2]>/<key>.pose` and are written through a
+    temporary file plus rename, so readers never see partial files. Once the
+    total size exceeds `max_bytes` the least recently used files are deleted.
+    The index is rebuilt from the directory (oldest mtime first) on startup.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._index = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.enabled:
+            try:
+                os.makedirs(directory, exist_ok=True)
+                self._load_index()
+            except OSError as e:
+                # e.g. a packaged app started from a read-only working directory
+                logging.warning(f"Pose cache disabled: cannot use {os.path.abspath(directory)!r}: {e}")
+                self.directory = ""
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory) and self.max_bytes > 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.pose")
+
+    @staticmethod
+    def _etag(key: str, stat: os.stat_result) -> str:
+        return f'"{key[:16]}-{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+    def _load_index(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".pose"):
+                    path = os.path.join(root, name)
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, name[:-len(".pose")], path, stat))
+        for _, key, path, stat in sorted(entries):
+            self._index[key] = CachedPose(path, stat.st_size, self._etag(key, stat))
+            self._bytes += stat.st_size
+        self._evict()
+        logging.info(f"Pose cache at {self.directory}: {len(self._index)} files, {self._bytes} bytes")
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._index:
+            key, entry = self._index.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def get(self, key: str) -> Optional[CachedPose]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is not None and not os.path.exists(entry.path):
+                # Removed behind our back
+                self._bytes -= entry.size
+                del self._index[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def open_writer(self, key: str) -> "PoseCacheWriter":
+        return PoseCacheWriter(self, key)
+
+    def put(self, key: str, data: bytes) -> Optional[CachedPose]:
+        """Store a complete pose file (blocking); returns None if it could not be stored"""
+        if not self.enabled:
+            return None
+        try:
+            writer = self.open_writer(key)
+        except OSError as e:
+            logging.warning(f"Could not store pose in cache: {e}")
+            return None
+        try:
+            writer.write(data)
+            return writer.commit()
+        except OSError as e:
+            writer.discard()
+            logging.warning(f"Could not store pose in cache: {e}")
+            return None
+
+    def _commit(self, key: str, temp_path: str) -> CachedPose:
+        path = self._path(key)
+        os.replace(temp_path, path)
+        stat = os.stat(path)
+        entry = CachedPose(path, stat.st_size, self._etag(key, stat))
+        with self._lock:
+            previous = self._index.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._index[key] = entry
+            self._bytes += entry.size
+            self._evict()
+        return entry
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "files": len(self._index),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+            }
+
+
+class PoseCacheWriter:
+    """Incrementally writes one pose file; nothing is visible until `commit`"""
+
+    def __init__(self, cache: PoseCache, key: str):
+        self._cache = cache
+        self._key = key
+        directory = os.path.dirname(cache._path(key))
+        os.makedirs(directory, exist_ok=True)
+        fd, self._temp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes):
+        self._file.write(chunk)
+
+    def commit(self) -> CachedPose:
+        self._file.close()
+        return self._cache._commit(self._key, self._temp_path)
+
+    def discard(self):
+        self._file.close()
+        try:
+            os.remove(self._temp_path)
+        except FileNotFoundError:
+            pass
+
+
+pose_cache = PoseCache(config.POSE_CACHE_DIR, config.POSE_CACHE_MAX_BYTES)
@@ -0,0 +1,103 @@
+import io
+from typing import List, Optional
+
+import numpy as np
+from pose_format import Pose
+from pose_format.numpy import NumPyPoseBody
+
+PRECISIONS = ("float32", "float16", "int16")
+COMPACT_MEDIA_TYPE = "application/x-pose-npz"
+
+_INT16_MASKED = np.iinfo(np.int16).min
+_INT16_LEVELS = np.iinfo(np.int16).max - np.iinfo(np.int16).min - 1  # one value is the mask sentinel
+
+
+def decode_pose(pose_data: bytes) -> Pose:
+    """Parse a binary .pose file; body data is a masked (frames, people, points, dims) array"""
+    return Pose.read(pose_data)
+
+
+def encode_pose(pose: Pose) -> bytes:
+    buffer = io.BytesIO()
+    pose.write(buffer)
+    return buffer.getvalue()
+
+
+def downsample(pose: Pose, target_fps: float) -> Pose:
+    """Keep the frames nearest to a `target_fps` grid; never upsamples"""
+    fps = pose.body.fps
+    frames = pose.body.data.shape[0]
+    if target_fps <= 0 or target_fps >= fps or frames == 0:
+        return pose
+    indexes = np.unique(np.round(np.arange(0, frames, fps / target_fps)).astype(np.int64))
+    indexes = indexes[indexes < frames]
+    body = NumPyPoseBody(fps=target_fps, data=pose.body.data[indexes], confidence=pose.body.confidence[indexes])
+    return Pose(pose.header, body)
+
+
+def drop_components(pose: Pose, components: List[str]) -> Pose:
+    """Remove keypoint groups such as FACE_LANDMARKS"""
+    if not components:
+        return pose
+    available = [component.name for component in pose.header.components]
+    unknown = [name for name in components if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown pose components {unknown}; available: {available}")
+    return pose.remove_components(components)
+
+
+def _header_bytes(pose: Pose) -> np.ndarray:
+    buffer = io.BytesIO()
+    pose.header.write(buffer)
+    return np.frombuffer(buffer.getvalue(), dtype=np.uint8)
+
+
+def encode_compact(pose: Pose, precision: str) -> bytes:
+    """Encode a pose as a compressed .npz with reduced-precision coordinates
+
+    Arrays: `header` (the original .pose header bytes), `fps`, `confidence`
+    (uint8, 0-255) and `data`. For "float16", `data` is float16 with masked
+    points set to NaN. For "int16", `data` is quantized per dimension as
+    `offset + (value + 32767) * scale` (arrays `offset`, `scale`), with
+    -32768 marking masked points.
+    """
+    data = pose.body.data
+    mask = np.ma.getmaskarray(data)
+    arrays = {
+        "header": _header_bytes(pose),
+        "fps": np.array(pose.body.fps, dtype=np.float32),
+        "confidence": np.round(np.clip(pose.body.confidence, 0, 1) * 255).astype(np.uint8),
+    }
+    if precision == "float16":
+        arrays["data"] = np.where(mask, np.nan, data.filled(0)).astype(np.float16)
+    elif precision == "int16":
+        values = data.filled(np.nan).astype(np.float64)
+        low = np.nan_to_num(np.nanmin(values, axis=(0, 1, 2)) if values.size else np.zeros(data.shape[-1]))
+        high = np.nan_to_num(np.nanmax(values, axis=(0, 1, 2)) if values.size else np.zeros(data.shape[-1]))
+        scale = np.where(high > low, (high - low) / _INT16_LEVELS, 1.0)
+        quantized = np.round((np.nan_to_num(values, nan=0.0) - low) / scale) - np.iinfo(np.int16).max
+        quantized = np.where(mask, _INT16_MASKED, quantized).astype(np.int16)
+        arrays.update(data=quantized, offset=low.astype(np.float32), scale=scale.astype(np.float32))
+    else:
+        raise ValueError(f"Unsupported compact precision: {precision!r}")
+
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def process_pose(pose_data: bytes, fps: Optional[float] = None, drop: Optional[List[str]] = None,
+                 precision: str = "float32") -> bytes:
+    """Decode, reduce and re-encode a pose (blocking, CPU-bound)
+
+    Returns a .pose file for "float32", otherwise the compact .npz encoding.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision {precision!r}; expected one of {PRECISIONS}")
+    pose = decode_pose(pose_data)
+    pose = drop_components(pose, drop or [])
+    if fps:
+        pose = downsample(pose, fps)
+    if precision == "float32":
+        return encode_pose(pose)
+    return encode_compact(pose, precision)
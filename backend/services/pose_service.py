@@ -0,0 +1,71 @@
+import httpx
+
+from config import config
+from services.http_clients import get_http_client
+from services.inference_executor import run_blocking
+from services.pose_cache import pose_cache, pose_cache_key
+from services.single_flight import SingleFlight
+from services.upstream_guard import get_upstream_guard
+
+_fetch_flight = SingleFlight()
+
+
+def pose_params(text: str, spoken_language: str, signed_language: str) -> dict:
+    return {
+        'text': text,
+        'spoken': spoken_language,
+        'signed': signed_language
+    }
+
+
+async def fetch_pose(text: str, spoken_language: str, signed_language: str) -> bytes:
+    """Fetch a whole binary pose file from the pose API; raises httpx.HTTPError on failure"""
+    params = pose_params(text, spoken_language, signed_language)
+    response = await get_upstream_guard("pose").request(
+        lambda: get_http_client("pose").get(config.POSE_API_URL, params=params)
+    )
+    response.raise_for_status()
+    return response.content
+
+
+async def open_pose_stream(text: str, spoken_language: str, signed_language: str) -> httpx.Response:
+    """Start a pose API request without reading its body
+
+    The caller iterates the body (e.g. `aiter_bytes`) and must `aclose()` the
+    response. Raises httpx.HTTPError if the upstream does not answer with 2xx.
+    """
+    client = get_http_client("pose")
+    params = pose_params(text, spoken_language, signed_language)
+    response = await get_upstream_guard("pose").request(
+        lambda: client.send(client.build_request("GET", config.POSE_API_URL, params=params), stream=True)
+    )
+    if response.is_error:
+        await response.aclose()
+        response.raise_for_status()
+    return response
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+async def get_or_fetch_pose(text: str, spoken_language: str, signed_language: str) -> bytes:
+    """Return a pose from the disk cache, fetching and storing it on a miss
+
+    Concurrent misses for the same request share one upstream call.
+    """
+    key = pose_cache_key(text, spoken_language, signed_language)
+    cached = pose_cache.get(key)
+    if cached is not None:
+        try:
+            return await run_blocking(read_file, cached.path)
+        except FileNotFoundError:
+            pass  # evicted between lookup and read
+
+    async def fetch_and_store():
+        pose_data = await fetch_pose(text, spoken_language, signed_language)
+        await run_blocking(pose_cache.put, key, pose_data)
+        return pose_data
+
+    return await _fetch_flight.do(key, fetch_and_store)
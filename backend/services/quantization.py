@@ -0,0 +1,124 @@
+import argparse
+import difflib
+import gc
+import time
+
+import torch
+from signwriting_translation.bin import load_sockeye_translator, translate
+
+from config import config
+from services.memory import current_rss_bytes, format_mb, module_size_bytes
+
+# Fixed phrase set used to compare quantized outputs against fp32
+COMPARISON_PHRASES = [
+    "Hello",
+    "Thank you",
+    "How are you?",
+    "Good morning",
+    "See you later",
+    "My name is John.",
+    "Where is the bathroom?",
+    "I am learning sign language.",
+    "Can you help me, please?",
+    "The weather is nice today.",
+    "What time does the train leave?",
+    "I would like a cup of coffee.",
+]
+
+
+def quantize_translator(translator):
+    """Apply dynamic int8 quantization to the linear layers of every model, in place
+
+    The Sockeye search objects keep references to the model instances, so the
+    modules are quantized in place rather than replaced.
+    """
+    for model in translator.models:
+        torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    return translator
+
+
+def load_translator_for_mode(model_path: str, quantization: str):
+    translator, tokenizer_path = load_sockeye_translator(model_path)
+    if quantization == "int8":
+        quantize_translator(translator)
+    elif quantization != "none":
+        raise ValueError(f"Unknown quantization mode: {quantization!r}")
+    return translator, tokenizer_path
+
+
+def _model_inputs(phrases, spoken_language: str, signed_language: str):
+    # Imported here to avoid a cycle: the translator module imports this one
+    from services.signwriting_translator import build_model_input
+    return [build_model_input(phrase, spoken_language, signed_language) for phrase in phrases]
+
+
+def _benchmark(translator, model_inputs, repeats: int):
+    translate(translator, model_inputs[:1])  # warm up tracing and allocator
+    start = time.perf_counter()
+    for _ in range(repeats):
+        outputs = [translate(translator, [model_input])[0] for model_input in model_inputs]
+    seconds_per_phrase = (time.perf_counter() - start) / (repeats * len(model_inputs))
+    return outputs, seconds_per_phrase
+
+
+def _fsw_similarity(a: str, b: str) -> float:
+    return difflib.SequenceMatcher(None, a.split(), b.split()).ratio()
+
+
+def compare_quantization(model_path: str, phrases=None, repeats: int = 3,
+                         spoken_language: str = "en", signed_language: str = "ase") -> dict:
+    """Compare int8 against fp32 outputs, latency and memory on a fixed phrase set"""
+    phrases = phrases or COMPARISON_PHRASES
+    model_inputs = _model_inputs(phrases, spoken_language, signed_language)
+    report = {"model_path": model_path, "phrases": len(phrases), "modes": {}}
+
+    outputs = {}
+    for mode in ("none", "int8"):
+        gc.collect()
+        rss_before = current_rss_bytes()
+        translator, _ = load_translator_for_mode(model_path, mode)
+        outputs[mode], seconds_per_phrase = _benchmark(translator, model_inputs, repeats)
+        report["modes"][mode] = {
+            "weights_bytes": module_size_bytes(translator.models),
+            "rss_growth_bytes": current_rss_bytes() - rss_before,
+            "ms_per_phrase": round(seconds_per_phrase * 1000, 2),
+        }
+        del translator
+
+    exact = sum(a == b for a, b in zip(outputs["none"], outputs["int8"]))
+    similarities = [_fsw_similarity(a, b) for a, b in zip(outputs["none"], outputs["int8"])]
+    report["accuracy"] = {
+        "exact_match_rate": round(exact / len(phrases), 4),
+        "mean_symbol_similarity": round(sum(similarities) / len(similarities), 4),
+        "mismatches": [
+            {"text": phrase, "fp32": a, "int8": b}
+            for phrase, a, b in zip(phrases, outputs["none"], outputs["int8"])
+            if a != b
+        ],
+    }
+    fp32, int8 = report["modes"]["none"], report["modes"]["int8"]
+    report["speedup"] = round(fp32["ms_per_phrase"] / int8["ms_per_phrase"], 2) if int8["ms_per_phrase"] else None
+    return report
+
+
+def print_report(report: dict):
+    print(f"Model: {report['model_path']} ({report['phrases']} phrases)")
+    print(f"{'mode':<6} {'weights':>10} {'RSS growth':>12} {'ms/phrase':>10}")
+    for mode, stats in report["modes"].items():
+        name = "fp32" if mode == "none" else mode
+        print(f"{name:<6} {format_mb(stats['weights_bytes']):>10} "
+              f"{format_mb(stats['rss_growth_bytes']):>12} {stats['ms_per_phrase']:>10}")
+    accuracy = report["accuracy"]
+    print(f"Speedup: {report['speedup']}x")
+    print(f"Exact match: {accuracy['exact_match_rate']:.1%}, "
+          f"mean symbol similarity: {accuracy['mean_symbol_similarity']:.1%}")
+    for mismatch in accuracy["mismatches"]:
+        print(f"  {mismatch['text']!r}\n    fp32: {mismatch['fp32']}\n    int8: {mismatch['int8']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare int8-quantized and fp32 Sockeye translation")
+    parser.add_argument("--model", default=config.SIGNWRITING_MODEL_PATH)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    print_report(compare_quantization(args.model, repeats=args.repeats))
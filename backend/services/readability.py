@@ -0,0 +1,104 @@
+import os
+import re
+import threading
+
+from config import config
+from services.text_segmentation import split_sentences
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+COMMON_WORDS_PATH = os.path.abspath(os.path.join(BASE_DIR, "..", "data", "common_words.txt"))
+
+_WORD = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)?|\d+")
+_VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+_SUFFIXES = ("s", "es", "ed", "d", "ing", "er", "est", "ly")
+
+_common_words = None
+_stats_lock = threading.Lock()
+_stats = {"checked": 0, "bypassed": 0}
+
+
+def _load_common_words():
+    global _common_words
+    if _common_words is None:
+        with open(COMMON_WORDS_PATH, encoding="utf-8") as f:
+            _common_words = {line.strip() for line in f if line.strip() and not line.startswith("#")}
+    return _common_words
+
+
+def _is_common(word: str) -> bool:
+    common = _load_common_words()
+    word = word.lower()
+    if word.isdigit() or word in common:
+        return True
+    word = word.replace("'", "")
+    if word in common:
+        return True
+    for suffix in _SUFFIXES:
+        if not word.endswith(suffix) or len(word) - len(suffix) < 2:
+            continue
+        stem = word[:-len(suffix)]
+        if stem in common or stem + "e" in common:  # "walks", "making"
+            return True
+        if len(stem) > 2 and stem[-1] == stem[-2] and stem[:-1] in common:  # "running"
+            return True
+        if stem.endswith("i") and stem[:-1] + "y" in common:  # "tried"
+            return True
+    return False
+
+
+def count_syllables(word: str) -> int:
+    word = word.lower()
+    syllables = len(_VOWEL_GROUPS.findall(word))
+    if word.endswith("e") and not word.endswith("le") and syllables > 1:
+        syllables -= 1
+    return max(1, syllables)
+
+
+def reading_ease(words, sentence_count: int = 1) -> float:
+    """Flesch reading ease (higher is easier)"""
+    syllables = sum(count_syllables(word) for word in words)
+    return 206.835 - 1.015 * (len(words) / sentence_count) - 84.6 * (syllables / len(words))
+
+
+def is_already_simple(text: str) -> bool:
+    """Fast local check for text that would not benefit from LLM simplification
+
+    Passes short texts of a sentence or two whose words are all in the common-word table
+    (names and numbers allowed) and whose reading ease is high enough.
+    """
+    with _stats_lock:
+        _stats["checked"] += 1
+    if not config.SIMPLIFY_BYPASS_ENABLED:
+        return False
+
+    sentences = split_sentences(text)
+    if not sentences or len(sentences) > config.SIMPLIFY_BYPASS_MAX_SENTENCES:
+        return False
+    sentence_words = [_WORD.findall(sentence) for sentence in sentences]
+    words = [word for sentence in sentence_words for word in sentence]
+    if not words or len(words) > config.SIMPLIFY_BYPASS_MAX_WORDS:
+        return False
+
+    # Capitalised words that do not start a sentence are treated as names
+    rare = [
+        word for sentence in sentence_words for i, word in enumerate(sentence)
+        if not (i > 0 and word[0].isupper()) and not _is_common(word)
+    ]
+    if len(rare) > config.SIMPLIFY_BYPASS_MAX_RARE_WORDS:
+        return False
+    if reading_ease(words, len(sentences)) < config.SIMPLIFY_BYPASS_MIN_READING_EASE:
+        return False
+
+    with _stats_lock:
+        _stats["bypassed"] += 1
+    return True
+
+
+def readability_metrics() -> dict:
+    with _stats_lock:
+        checked, bypassed = _stats["checked"], _stats["bypassed"]
+    return {
+        "checked": checked,
+        "bypassed": bypassed,
+        "bypass_rate": round(bypassed / checked, 4) if checked else 0,
+    }
@@ -0,0 +1,226 @@
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from signwriting_translation.bin import tokenize_spoken_text, translate
+
+from config import config
+from services.inference_executor import run_inference
+from services.micro_batcher import BatcherClosed, MicroBatcher
+from services.memory import current_rss_bytes, format_mb, module_size_bytes
+from services.quantization import load_translator_for_mode
+from services.translation_cache import translation_cache
+
+# Language codes become `$xx` control tokens in the model input, so only plain codes are accepted
+_LANGUAGE_CODE = re.compile(r"^[a-z]{2,3}(-[A-Za-z]{2,8})?$")
+
+
+class InvalidLanguageError(ValueError):
+    """Raised for language codes that cannot be used as model control tokens"""
+
+
+class _LoadedTranslator:
+    """A resident Sockeye translator with its own call lock and micro-batcher"""
+
+    def __init__(self, model_path: str, translator, tokenizer_path, size_bytes: int):
+        self.model_path = model_path
+        self.translator = translator
+        self.tokenizer_path = tokenizer_path
+        self.size_bytes = size_bytes
+        # Callers currently using the translator; guarded by the pool lock
+        self.in_use = 0
+        self.lock = threading.Lock()
+        self.batcher = MicroBatcher(
+            f"signwriting:{model_path}",
+            self._translate_batch,
+            max_batch_size=config.SIGNWRITING_BATCH_MAX_SIZE,
+            max_wait_ms=config.SIGNWRITING_BATCH_MAX_WAIT_MS,
+        )
+
+    def translate(self, model_inputs):
+        with self.lock:
+            return translate(self.translator, model_inputs)
+
+    async def _translate_batch(self, model_inputs):
+        return await run_inference(self.translate, model_inputs)
+
+
+class TranslatorPool:
+    """Keeps loaded translators resident, keyed by model path
+
+    Models are evicted least-recently-used first once their combined size
+    exceeds `memory_budget_bytes`. Pinned models and models held by a caller
+    (`hold=True` until `release`) are never evicted; a model that was over
+    budget while held is evicted once it is released.
+    """
+
+    def __init__(self, memory_budget_bytes: int, pinned_models):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.pinned_models = set(pinned_models)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self.loads = 0
+        self.evictions = 0
+
+    def _load_lock_for(self, model_path: str) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault(model_path, threading.Lock())
+
+    def _loaded_bytes(self) -> int:
+        return sum(entry.size_bytes for entry in self._entries.values())
+
+    def _evict_to_budget(self, keep: str = None):
+        for model_path in list(self._entries):
+            if self._loaded_bytes() <= self.memory_budget_bytes:
+                return
+            if model_path == keep or model_path in self.pinned_models or self._entries[model_path].in_use:
+                continue
+            entry = self._entries.pop(model_path)
+            # The batcher's worker task holds the translator alive until it stops
+            entry.batcher.close()
+            self.evictions += 1
+            logging.info(f"Evicted Sockeye translator '{model_path}' ({format_mb(entry.size_bytes)})")
+        if self._loaded_bytes() > self.memory_budget_bytes:
+            logging.warning(
+                f"Loaded translators use {format_mb(self._loaded_bytes())}, above the "
+                f"{format_mb(self.memory_budget_bytes)} budget, but the rest are pinned or in use"
+            )
+
+    def _load(self, model_path: str) -> _LoadedTranslator:
+        rss_before = current_rss_bytes()
+        start = time.perf_counter()
+        translator, tokenizer_path = load_translator_for_mode(model_path, config.SIGNWRITING_QUANTIZATION)
+        elapsed = time.perf_counter() - start
+        rss_after = current_rss_bytes()
+        size_bytes = module_size_bytes(translator.models)
+        logging.info(
+            f"Loaded Sockeye translator '{model_path}' ({config.SIGNWRITING_QUANTIZATION}) in {elapsed:.2f}s "
+            f"(parameters: {format_mb(size_bytes)}, "
+            f"RSS +{format_mb(rss_after - rss_before)}, total RSS {format_mb(rss_after)})"
+        )
+        return _LoadedTranslator(model_path, translator, tokenizer_path, size_bytes)
+
+    def get(self, model_path: str, hold: bool = False) -> _LoadedTranslator:
+        """Return the resident translator for `model_path`, loading it if needed (blocking)"""
+        entry = self.get_if_loaded(model_path, hold)
+        if entry is not None:
+            return entry
+
+        with self._load_lock_for(model_path):
+            with self._lock:
+                entry = self._entries.get(model_path)
+                if entry is not None:
+                    if hold:
+                        entry.in_use += 1
+                    return entry
+            entry = self._load(model_path)
+            with self._lock:
+                self._entries[model_path] = entry
+                self.loads += 1
+                if hold:
+                    entry.in_use += 1
+                self._evict_to_budget(keep=model_path)
+            return entry
+
+    def get_if_loaded(self, model_path: str, hold: bool = False):
+        """Return the translator if it is already resident, without loading it"""
+        with self._lock:
+            entry = self._entries.get(model_path)
+            if entry is not None:
+                self._entries.move_to_end(model_path)
+                if hold:
+                    entry.in_use += 1
+            return entry
+
+    def release(self, entry: _LoadedTranslator):
+        """Drop a hold taken with `hold=True`"""
+        with self._lock:
+            entry.in_use -= 1
+            if not entry.in_use:
+                self._evict_to_budget()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "loaded_bytes": self._loaded_bytes(),
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "quantization": config.SIGNWRITING_QUANTIZATION,
+                "models": {
+                    model_path: {
+                        "size_bytes": entry.size_bytes,
+                        "pinned": model_path in self.pinned_models,
+                        "in_use": entry.in_use,
+                        "batcher": entry.batcher.metrics(),
+                    }
+                    for model_path, entry in self._entries.items()
+                },
+            }
+
+
+translator_pool = TranslatorPool(
+    memory_budget_bytes=config.SIGNWRITING_POOL_MEMORY_MB * 1024 * 1024,
+    pinned_models=config.get_signwriting_pinned_models(),
+)
+
+
+def model_path_for(spoken_language: str, signed_language: str) -> str:
+    """Pick the model serving a language pair, defaulting to the multilingual model"""
+    for code in (spoken_language, signed_language):
+        if not _LANGUAGE_CODE.match(code):
+            raise InvalidLanguageError(f"Invalid language code: {code!r}")
+    models = config.get_signwriting_models()
+    return models.get(f"{spoken_language}-{signed_language}", config.SIGNWRITING_MODEL_PATH)
+
+
+def load_translator():
+    """Load the default translator into the pool, logging load time and memory"""
+    return translator_pool.get(config.SIGNWRITING_MODEL_PATH)
+
+
+def is_translator_ready() -> bool:
+    return translator_pool.get_if_loaded(config.SIGNWRITING_MODEL_PATH) is not None
+
+
+def translate_inputs(model_inputs, model_path: str = None):
+    """Translate already-prefixed model inputs with a pooled translator (blocking)"""
+    entry = translator_pool.get(model_path or config.SIGNWRITING_MODEL_PATH, hold=True)
+    try:
+        return entry.translate(model_inputs)
+    finally:
+        translator_pool.release(entry)
+
+
+def build_model_input(text: str, spoken_language: str = "en", signed_language: str = "ase") -> str:
+    tokenized_text = tokenize_spoken_text(text)
+    return f"${spoken_language} ${signed_language} {tokenized_text}"
+
+
+async def translate_text(text: str, spoken_language: str = "en", signed_language: str = "ase") -> str:
+    """Translate one text to FSW, going through the result cache and the micro-batcher"""
+    model_path = model_path_for(spoken_language, signed_language)
+    cache_key = translation_cache.make_key(
+        text, spoken_language, signed_language, model_path, config.SIGNWRITING_QUANTIZATION
+    )
+    signwriting = await translation_cache.get_async(cache_key)
+    if signwriting is None:
+        model_input = build_model_input(text, spoken_language, signed_language)
+        while True:
+            # The hold is taken on the event loop so a cancelled load cannot leak it
+            entry = translator_pool.get_if_loaded(model_path, hold=True)
+            if entry is None:
+                await run_inference(translator_pool.get, model_path)
+                continue
+            try:
+                signwriting = await entry.batcher.submit(model_input)
+                break
+            except BatcherClosed:
+                continue  # evicted under us; fetch the model from the pool again
+            finally:
+                translator_pool.release(entry)
+        await translation_cache.put_async(cache_key, signwriting)
+    return signwriting
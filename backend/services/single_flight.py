@@ -0,0 +1,29 @@
+import asyncio
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one in-flight call
+
+    Every caller awaiting a key receives the result (or exception) of the
+    first caller's coroutine. The shared call is shielded, so one caller
+    disconnecting does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._in_flight = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn):
+        task = self._in_flight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def metrics(self) -> dict:
+        return {"in_flight": len(self._in_flight), "calls": self.calls, "coalesced": self.coalesced}
@@ -0,0 +1,35 @@
+import re
+import unicodedata
+from typing import List
+
+# A sentence ends at ., ! or ? (optionally followed by closing quotes/brackets)
+# when whitespace follows. Common abbreviations are not split on.
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])[\"')\]]*\s+")
+_ABBREVIATIONS = {"mr.", "mrs.", "ms.", "dr.", "prof.", "sr.", "jr.", "st.", "vs.", "etc.", "e.g.", "i.e."}
+# Dotted initials such as "U.S.", "a.m." or the "J." in "J. Smith"
+_INITIALS = re.compile(r"^(?:[a-z]\.)+$")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences, keeping their punctuation"""
+    sentences = []
+    current = ""
+    position = 0
+    for match in _SENTENCE_BOUNDARY.finditer(text):
+        current += text[position:match.end()]
+        position = match.end()
+        last_word = current.split()[-1].lower().lstrip("\"'([") if current.split() else ""
+        if last_word in _ABBREVIATIONS or _INITIALS.match(last_word):
+            continue
+        if current.strip():
+            sentences.append(current.strip())
+        current = ""
+    current += text[position:]
+    if current.strip():
+        sentences.append(current.strip())
+    return sentences
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys: NFC, single spaces, no outer whitespace"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
@@ -0,0 +1,365 @@
+import asyncio
+import json
+import logging
+import re
+import time
+
+import httpx
+
+from config import config
+from services.http_clients import get_http_client
+from services.latency import LatencyTracker
+from services.local_simplifier import simplify_locally
+from services.single_flight import SingleFlight
+from services.upstream_guard import UpstreamUnavailable, get_upstream_guard
+from services.text_segmentation import normalize_text, split_sentences
+from services.ttl_cache import TTLCache
+
+SIMPLIFY_MODEL = "llama3-70b-8192"
+
+simplification_cache = TTLCache(
+    max_entries=config.SIMPLIFY_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.SIMPLIFY_CACHE_TTL_SECONDS,
+)
+_simplify_flight = SingleFlight()
+_batch_stats = {"batch_calls": 0, "batched_items": 0, "fallback_items": 0}
+_upstream_latency = LatencyTracker()
+_budget_stats = {"hedged": 0, "timeouts": 0, "errors": 0}
+
+# Batch calls queue for rate-limit tokens as long as it takes; their concurrency is bounded instead
+_BATCH_QUEUE_WAIT = float("inf")
+
+# "3. Some sentence" or "3) Some sentence"
+_NUMBERED_LINE = re.compile(r"^\s*(\d+)[.)]\s*(.+?)\s*$")
+
+
+def groq_headers() -> dict:
+    return {
+        "Authorization": f"Bearer {config.GROQ_API_KEY}",
+        "Content-Type": "application/json"
+    }
+
+
+def completion_content(response: httpx.Response) -> str:
+    """Message content of a chat completion; a malformed body raises httpx.DecodingError"""
+    try:
+        return response.json().get("choices", [{}])[0].get("message", {}).get("content", "")
+    except (ValueError, AttributeError, IndexError, TypeError) as e:
+        # An upstream failure like any other, so callers fall back or answer 503 instead of a bare 500
+        raise httpx.DecodingError(f"Malformed completion from Groq: {e}")
+
+
+def simplification_prompt(text: str) -> str:
+    return f"Simplify this text in one short sentence, and only return me the Simplify text nothing it should not contain any bulit points, it should be just a sentence here is the text: {text}"
+
+
+async def request_simplification(text: str, max_wait: float = None) -> str:
+    """Ask Groq to simplify one text; raises httpx.HTTPError on failure
+
+    `max_wait` is passed to the upstream guard's rate-limit queue.
+    """
+    payload = {
+        "model": SIMPLIFY_MODEL,
+        "messages": [
+            {"role": "user", "content": simplification_prompt(text)}
+        ]
+    }
+    start = time.perf_counter()
+    response = await get_upstream_guard("groq").request(
+        lambda: get_http_client("groq").post(config.GROQ_API_URL, json=payload, headers=groq_headers()), max_wait
+    )
+    response.raise_for_status()
+    content = completion_content(response)
+    _upstream_latency.record(time.perf_counter() - start)
+    return content
+
+
+async def _simplify_uncached(key: str, text: str, max_wait: float = None) -> str:
+    async def call_upstream():
+        result = await request_simplification(text, max_wait)
+        simplification_cache.put(key, result)
+        return result
+
+    return await _simplify_flight.do(key, call_upstream)
+
+
+async def simplify(text: str, max_wait: float = None) -> str:
+    """Simplify text through the TTL cache, coalescing identical in-flight requests"""
+    key = normalize_text(text)
+    simplified = simplification_cache.get(key)
+    if simplified is not None:
+        return simplified
+    return await _simplify_uncached(key, text, max_wait)
+
+
+async def _hedged_upstream(key: str, text: str) -> str:
+    """Call upstream, firing a second request if the first outlives the recent p95 latency"""
+    tasks = {asyncio.ensure_future(_simplify_uncached(key, text))}
+    hedge_after = None
+    if config.SIMPLIFY_HEDGE_ENABLED:
+        hedge_after = _upstream_latency.percentile(
+            config.SIMPLIFY_HEDGE_PERCENTILE, min_samples=config.SIMPLIFY_HEDGE_MIN_SAMPLES
+        )
+    if hedge_after is not None:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done:
+            _budget_stats["hedged"] += 1
+            # Bypasses single-flight on purpose: the point is a second, independent request
+            tasks.add(asyncio.ensure_future(request_simplification(text)))
+
+    error = None
+    try:
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    simplification_cache.put(key, task.result())
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _consume_result(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logging.warning(f"Background simplification failed: {task.exception()}")
+
+
+async def simplify_with_source(text: str, latency_budget_ms: float = None):
+    """Simplify text within a latency budget, returning (simplified_text, source)
+
+    `source` is "cache", "llm" or "local". When the budget (defaulting to
+    SIMPLIFY_LATENCY_BUDGET_MS; 0 disables it) runs out, or the upstream fails,
+    the local rule-based simplifier answers instead. It also answers whenever
+    the upstream guard rejects the call (circuit open). A timed-out upstream call
+    keeps running in the background so its result still lands in the cache.
+    """
+    key = normalize_text(text)
+    cached = simplification_cache.get(key)
+    if cached is not None:
+        return cached, "cache"
+
+    budget_ms = config.SIMPLIFY_LATENCY_BUDGET_MS if latency_budget_ms is None else latency_budget_ms
+    if budget_ms <= 0:
+        try:
+            return await _simplify_uncached(key, text), "llm"
+        except UpstreamUnavailable as e:
+            # Circuit open or rate limit saturated: answer locally instead of failing
+            logging.warning(f"Simplification upstream unavailable, answering locally: {e}")
+            return simplify_locally(text), "local"
+
+    upstream = asyncio.ensure_future(_hedged_upstream(key, text))
+    try:
+        return await asyncio.wait_for(asyncio.shield(upstream), budget_ms / 1000), "llm"
+    except asyncio.TimeoutError:
+        _budget_stats["timeouts"] += 1
+        upstream.add_done_callback(_consume_result)
+        logging.info(f"Simplification exceeded its {budget_ms:.0f} ms budget, answering locally")
+    except httpx.HTTPError as e:
+        _budget_stats["errors"] += 1
+        logging.warning(f"Simplification upstream failed, answering locally: {e}")
+    return simplify_locally(text), "local"
+
+
+def clean_sentence(text: str) -> str:
+    """Reduce an LLM completion to a single plain sentence"""
+    lines = [line.strip() for line in text.strip().splitlines() if line.strip()]
+    sentence = lines[0] if lines else ""
+    sentence = sentence.strip('"').strip().lstrip("-*• ").strip().strip('"').strip()
+    return " ".join(sentence.split())
+
+
+async def stream_simplification(text: str):
+    """Yield simplified text fragments as Groq streams them; raises httpx.HTTPError on failure"""
+    payload = {
+        "model": SIMPLIFY_MODEL,
+        "messages": [
+            {"role": "user", "content": simplification_prompt(text)}
+        ],
+        "stream": True,
+    }
+    guard = get_upstream_guard("groq")
+    probe = await guard.acquire()
+    client = get_http_client("groq")
+    try:
+        async with client.stream("POST", config.GROQ_API_URL, json=payload, headers=groq_headers()) as response:
+            guard.record_response(response.status_code)
+            response.raise_for_status()
+            async for fragment in _completion_fragments(response):
+                yield fragment
+    except httpx.TransportError:
+        guard.record_error()
+        raise
+    except BaseException:
+        # A client disconnect cancels us; never leave the half-open probe slot taken
+        guard.release(probe)
+        raise
+
+
+async def _completion_fragments(response):
+    """Extract content deltas from an OpenAI-style SSE completion stream"""
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            break
+        try:
+            chunk = json.loads(data)
+        except json.JSONDecodeError:
+            continue
+        content = chunk.get("choices", [{}])[0].get("delta", {}).get("content")
+        if content:
+            yield content
+
+
+async def stream_simplify_events(text: str):
+    """Yield ("token" | "sentence" | "done", payload) events for a streamed simplification
+
+    A "sentence" event is emitted as soon as a sentence boundary has been
+    streamed (and for the trailing sentence at the end), so callers can start downstream work before the completion ends.
+    Cached results produce a single "done" event.
+    """
+    key = normalize_text(text)
+    cached = simplification_cache.get(key)
+    if cached is not None:
+        yield "done", {"simplified_text": clean_sentence(cached), "cached": True, "already_simple": False}
+        return
+
+    completion = ""
+    sentences_sent = 0
+    async for fragment in stream_simplification(text):
+        completion += fragment
+        yield "token", {"text": fragment}
+        # Every sentence except the last one in the buffer is complete
+        sentences = split_sentences(completion)
+        for sentence in sentences[sentences_sent:-1]:
+            yield "sentence", {"index": sentences_sent, "text": clean_sentence(sentence)}
+            sentences_sent += 1
+
+    for sentence in split_sentences(completion)[sentences_sent:]:
+        yield "sentence", {"index": sentences_sent, "text": clean_sentence(sentence)}
+        sentences_sent += 1
+
+    simplification_cache.put(key, completion)
+    yield "done", {"simplified_text": clean_sentence(completion), "cached": False, "already_simple": False}
+
+
+def batch_simplification_prompt(texts) -> str:
+    numbered = "\n".join(f"{i}. {normalize_text(text)}" for i, text in enumerate(texts, start=1))
+    return (
+        f"Simplify each of the following {len(texts)} texts into one short sentence. "
+        f"Return exactly {len(texts)} lines in the same order, each formatted as "
+        f"'<number>. <simplified sentence>', with no bullet points and no other text.\n\n{numbered}"
+    )
+
+
+def parse_numbered_output(content: str, count: int) -> dict:
+    """Map item numbers (1-based) to their simplified sentence, dropping invalid lines"""
+    parsed = {}
+    for line in content.splitlines():
+        match = _NUMBERED_LINE.match(line)
+        if not match:
+            continue
+        number, sentence = int(match.group(1)), match.group(2).strip()
+        if not 1 <= number <= count or number in parsed:
+            continue
+        if not sentence or sentence[0] in "-*•":
+            continue
+        parsed[number] = sentence
+    return parsed
+
+
+async def _simplify_chunk(texts):
+    """Simplify a chunk of texts with one packed prompt; None marks items that failed validation
+
+    Upstream failures (transport errors, non-2xx after retries, an open
+    circuit) raise httpx.HTTPError rather than turning into per-item calls.
+    """
+    payload = {
+        "model": SIMPLIFY_MODEL,
+        "messages": [
+            {"role": "user", "content": batch_simplification_prompt(texts)}
+        ]
+    }
+    _batch_stats["batch_calls"] += 1
+    _batch_stats["batched_items"] += len(texts)
+    response = await get_upstream_guard("groq").request(
+        lambda: get_http_client("groq").post(config.GROQ_API_URL, json=payload, headers=groq_headers()),
+        _BATCH_QUEUE_WAIT,
+    )
+    response.raise_for_status()
+    try:
+        content = completion_content(response)
+    except httpx.DecodingError as e:
+        logging.warning(f"Batch simplification of {len(texts)} texts returned malformed JSON, falling back per item: {e}")
+        return [None] * len(texts)
+    parsed = parse_numbered_output(content, len(texts))
+    return [parsed.get(i) for i in range(1, len(texts) + 1)]
+
+
+async def _limited(semaphore: asyncio.Semaphore, call):
+    async with semaphore:
+        return await call()
+
+
+async def simplify_batch(texts):
+    """Simplify many texts with packed prompts, falling back per item for invalid outputs
+
+    At most SIMPLIFY_BATCH_CONCURRENCY upstream calls run at once, and they
+    wait for rate-limit tokens rather than failing fast, so a batch larger
+    than the bucket's burst is paced instead of rejected.
+    """
+    keys = [normalize_text(text) for text in texts]
+    results = {key: simplification_cache.get(key) for key in set(keys)}
+    pending = {}
+    for text, key in zip(texts, keys):
+        if results[key] is None and key not in pending:
+            pending[key] = text
+
+    pending_keys = list(pending)
+    chunk_size = max(1, config.SIMPLIFY_BATCH_MAX_ITEMS)
+    chunks = [pending_keys[i:i + chunk_size] for i in range(0, len(pending_keys), chunk_size)]
+    semaphore = asyncio.Semaphore(max(1, config.SIMPLIFY_BATCH_CONCURRENCY))
+    chunk_outputs = await asyncio.gather(
+        *[_limited(semaphore, lambda chunk=chunk: _simplify_chunk([pending[key] for key in chunk])) for chunk in chunks],
+        return_exceptions=True,
+    )
+
+    fallback_keys = []
+    upstream_error = None
+    for chunk, outputs in zip(chunks, chunk_outputs):
+        if isinstance(outputs, BaseException):
+            upstream_error = upstream_error or outputs
+            continue
+        for key, simplified in zip(chunk, outputs):
+            if simplified is None:
+                fallback_keys.append(key)
+            else:
+                simplification_cache.put(key, simplified)
+                results[key] = simplified
+
+    if upstream_error is not None:
+        # Chunks that succeeded are cached above; per-item calls would only hammer a failing upstream
+        raise upstream_error
+
+    if fallback_keys:
+        _batch_stats["fallback_items"] += len(fallback_keys)
+        fallbacks = await asyncio.gather(*[
+            _limited(semaphore, lambda key=key: simplify(pending[key], _BATCH_QUEUE_WAIT)) for key in fallback_keys
+        ])
+        results.update(zip(fallback_keys, fallbacks))
+
+    return [results[key] for key in keys]
+
+
+def simplifier_metrics() -> dict:
+    return {
+        "cache": simplification_cache.metrics(),
+        "single_flight": _simplify_flight.metrics(),
+        "batch": dict(_batch_stats),
+        "latency_budget": dict(_budget_stats),
+        "upstream_latency": _upstream_latency.metrics(),
+    }
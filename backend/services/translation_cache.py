@@ -0,0 +1,177 @@
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from config import config
+from services.inference_executor import run_blocking
+from services.text_segmentation import normalize_text
+
+# Rough per-entry bookkeeping cost of the OrderedDict node and the two str objects
+_ENTRY_OVERHEAD_BYTES = 200
+# Keys per IN (...) query, below SQLite's default limit on bound parameters
+_SQL_BATCH = 500
+
+
+class TranslationCache:
+    """Two-tier cache of translation results
+
+    The first tier is an in-memory LRU bounded by `max_bytes`. The optional
+    second tier is a SQLite file that survives restarts; entries found there
+    are promoted back into memory. Async callers use the `*_async` methods,
+    which keep SQLite reads and commits off the event loop.
+    """
+
+    def __init__(self, max_bytes: int, db_path: str = ""):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Separate from `_lock` so memory hits on the event loop never wait behind a disk query
+        self._db_lock = threading.Lock()
+        self._db = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if db_path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("PRAGMA synchronous=NORMAL")
+                self._db.execute("CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                self._db.commit()
+                logging.info(f"Translation cache persisted to {db_path}")
+            except (OSError, sqlite3.Error) as e:
+                # Fall back to the in-memory tier rather than failing the import
+                logging.warning(f"Persistent translation cache disabled: cannot use {os.path.abspath(db_path)!r}: {e}")
+                if self._db is not None:
+                    self._db.close()
+                self._db = None
+
+    @staticmethod
+    def make_key(text: str, spoken_language: str, signed_language: str, model_path: str, quantization: str) -> str:
+        # The model and its quantization are part of the key so persisted results never outlive a model change
+        return f"{model_path}\x1f{quantization}\x1f{spoken_language}\x1f{signed_language}\x1f{normalize_text(text)}"
+
+    @staticmethod
+    def _entry_size(key: str, value: str) -> int:
+        return len(key.encode("utf-8")) + len(value.encode("utf-8")) + _ENTRY_OVERHEAD_BYTES
+
+    def _remember(self, key: str, value: str):
+        if key in self._entries:
+            self._bytes -= self._entry_size(key, self._entries.pop(key))
+        size = self._entry_size(key, value)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = value
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            old_key, old_value = self._entries.popitem(last=False)
+            self._bytes -= self._entry_size(old_key, old_value)
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+            return value
+
+    def _load(self, keys: List[str]) -> Dict[str, str]:
+        """Look `keys` up in the SQLite tier (blocking) and promote the hits into memory"""
+        found = {}
+        if self._db is not None:
+            try:
+                with self._db_lock:
+                    for start in range(0, len(keys), _SQL_BATCH):
+                        batch = keys[start:start + _SQL_BATCH]
+                        placeholders = ",".join("?" * len(batch))
+                        found.update(self._db.execute(
+                            f"SELECT key, value FROM translations WHERE key IN ({placeholders})", batch
+                        ).fetchall())
+            except sqlite3.Error as e:
+                logging.warning(f"Could not read persisted translations: {e}")
+        with self._lock:
+            for key, value in found.items():
+                self._remember(key, value)
+            self.disk_hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    async def _load_async(self, keys: List[str]) -> Dict[str, str]:
+        if self._db is None:
+            return self._load(keys)
+        return await run_blocking(self._load, keys)
+
+    def _persist(self, items: List[Tuple[str, str]]):
+        """Write entries to the SQLite tier in one transaction (blocking)"""
+        if self._db is None or not items:
+            return
+        try:
+            with self._db_lock:
+                self._db.executemany("INSERT OR REPLACE INTO translations (key, value) VALUES (?, ?)", items)
+                self._db.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"Could not persist {len(items)} translations: {e}")
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._memory_get(key)
+        return value if value is not None else self._load([key]).get(key)
+
+    async def get_async(self, key: str) -> Optional[str]:
+        """Like `get`, but the SQLite lookup runs on the I/O thread pool"""
+        value = self._memory_get(key)
+        return value if value is not None else (await self._load_async([key])).get(key)
+
+    async def get_many_async(self, keys: List[str]) -> List[Optional[str]]:
+        """Look up many keys, reading every memory miss with a single SQLite query off the event loop"""
+        found = {}
+        for key in dict.fromkeys(keys):
+            value = self._memory_get(key)
+            if value is not None:
+                found[key] = value
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if missing:
+            found.update(await self._load_async(missing))
+        return [found.get(key) for key in keys]
+
+    def put(self, key: str, value: str):
+        with self._lock:
+            self._remember(key, value)
+        self._persist([(key, value)])
+
+    async def put_many_async(self, items: List[Tuple[str, str]]):
+        """Store entries in memory now and persist them with one commit on the I/O thread pool"""
+        items = list(items)
+        with self._lock:
+            for key, value in items:
+                self._remember(key, value)
+        if self._db is not None and items:
+            await run_blocking(self._persist, items)
+
+    async def put_async(self, key: str, value: str):
+        await self.put_many_async([(key, value)])
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0,
+                "persistent": self._db is not None,
+            }
+
+
+translation_cache = TranslationCache(
+    max_bytes=config.SIGNWRITING_CACHE_MAX_BYTES,
+    db_path=config.SIGNWRITING_CACHE_DB_PATH,
+)
@@ -0,0 +1,234 @@
+import asyncio
+import logging
+import random
+import time
+
+import httpx
+
+from config import config
+
+
+class UpstreamUnavailable(httpx.HTTPError):
+    """Raised without calling the upstream when its circuit is open or its rate limit is saturated"""
+
+
+class TokenBucket:
+    """Adaptive token bucket: halves its rate on 429s and recovers gradually on success"""
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.max_rate = rate_per_second
+        self.rate = rate_per_second
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, max_wait: float):
+        """Reserve a token up front and sleep off the deficit
+
+        Tokens may go negative, so the deficit includes every caller already
+        waiting and the queue wait is bounded by `max_wait`.
+        """
+        if self.rate <= 0:
+            return
+        self._refill()
+        wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0
+        if wait > max_wait:
+            raise UpstreamUnavailable(f"rate limit queue wait {wait:.1f}s exceeds {max_wait:.1f}s")
+        self._tokens -= 1
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except BaseException:
+                self._tokens += 1  # hand the reservation back to the callers behind us
+                raise
+
+    def throttle(self):
+        self.rate = max(self.max_rate / 16, self.rate / 2)
+
+    def recover(self):
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures; after `reset_seconds` lets one probe through
+
+    A probe that neither succeeds nor fails within `reset_seconds` is treated as
+    lost and the circuit re-opens, so a stuck probe cannot block it for good.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started = 0.0
+        self.times_opened = 0
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        now = time.monotonic()
+        if (self.state == self.HALF_OPEN and self._probe_in_flight
+                and now - self._probe_started >= self.reset_seconds):
+            self.state = self.OPEN
+            self._opened_at = now
+            self._probe_in_flight = False
+        if self.state == self.OPEN and now - self._opened_at >= self.reset_seconds:
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            self._probe_started = now
+            return True
+        return False
+
+    def release_probe(self):
+        """Give back a half-open probe slot that was admitted but never used"""
+        self._probe_in_flight = False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
+def _is_retryable(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+
+class UpstreamGuard:
+    """Rate limiting, retry with jittered backoff and circuit breaking for one upstream"""
+
+    def __init__(self, name: str, rate_per_second: float, burst: int, max_retries: int):
+        self.name = name
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.breaker = CircuitBreaker(config.CIRCUIT_FAILURE_THRESHOLD, config.CIRCUIT_RESET_SECONDS)
+        self.max_retries = max_retries
+        self.stats = {"requests": 0, "retries": 0, "throttled": 0, "rejected": 0, "failures": 0}
+
+    async def acquire(self, max_wait: float = None) -> bool:
+        """Admit one upstream call; raises UpstreamUnavailable instead of calling a sick upstream
+
+        `max_wait` (seconds) overrides UPSTREAM_MAX_QUEUE_WAIT_MS for callers
+        that would rather wait for a token than fail fast. Returns whether the
+        call is the half-open probe; pass that to `release` if the call ends
+        (e.g. is cancelled) without a recorded outcome.
+        """
+        if not self.breaker.allow():
+            self.stats["rejected"] += 1
+            raise UpstreamUnavailable(f"{self.name} upstream circuit is open")
+        probe = self.breaker.state == CircuitBreaker.HALF_OPEN
+        try:
+            await self.bucket.acquire(config.UPSTREAM_MAX_QUEUE_WAIT_MS / 1000 if max_wait is None else max_wait)
+        except BaseException as e:
+            self.release(probe)
+            if isinstance(e, UpstreamUnavailable):
+                self.stats["rejected"] += 1
+            raise
+        self.stats["requests"] += 1
+        return probe
+
+    def release(self, probe: bool):
+        if probe:
+            self.breaker.release_probe()
+
+    def record_response(self, status_code: int):
+        if status_code == 429:
+            self.stats["throttled"] += 1
+            self.bucket.throttle()
+        if _is_retryable(status_code):
+            self.stats["failures"] += 1
+            self.breaker.record_failure()
+        else:
+            self.bucket.recover()
+            self.breaker.record_success()
+
+    def record_error(self):
+        self.stats["failures"] += 1
+        self.breaker.record_failure()
+
+    def _backoff(self, attempt: int, response: httpx.Response = None) -> float:
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), config.UPSTREAM_BACKOFF_MAX_MS / 1000)
+            except ValueError:
+                pass
+        ceiling = min(config.UPSTREAM_BACKOFF_MAX_MS, config.UPSTREAM_BACKOFF_BASE_MS * 2 ** attempt) / 1000
+        return random.uniform(0, ceiling)  # full jitter
+
+    async def request(self, send, max_wait: float = None) -> httpx.Response:
+        """Await `send()` under the guard, retrying 429/5xx and transport errors
+
+        Returns the last response (callers still call raise_for_status) or
+        re-raises the last transport error.
+        """
+        for attempt in range(self.max_retries + 1):
+            probe = await self.acquire(max_wait)
+            try:
+                response = await send()
+            except httpx.TransportError as e:
+                self.record_error()
+                if attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logging.warning(f"{self.name} upstream error ({e}), retrying in {delay:.2f}s")
+            except BaseException:
+                # Cancelled (e.g. a losing hedge or a disconnected client) before any outcome
+                self.release(probe)
+                raise
+            else:
+                self.record_response(response.status_code)
+                if not _is_retryable(response.status_code) or attempt == self.max_retries:
+                    return response
+                delay = self._backoff(attempt, response)
+                # Release the connection of a streamed response we are not going to read
+                await response.aclose()
+                logging.warning(f"{self.name} upstream returned {response.status_code}, retrying in {delay:.2f}s")
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+    def metrics(self) -> dict:
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.consecutive_failures,
+            "times_opened": self.breaker.times_opened,
+            "rate_per_second": round(self.bucket.rate, 3),
+            **self.stats,
+        }
+
+
+_guards = {
+    "groq": UpstreamGuard(
+        "groq", config.GROQ_RATE_LIMIT_PER_SECOND, config.GROQ_RATE_LIMIT_BURST, config.GROQ_MAX_RETRIES
+    ),
+    "pose": UpstreamGuard(
+        "pose", config.POSE_RATE_LIMIT_PER_SECOND, config.POSE_RATE_LIMIT_BURST, config.POSE_MAX_RETRIES
+    ),
+}
+
+
+def get_upstream_guard(name: str) -> UpstreamGuard:
+    return _guards[name]
+
+
+def upstream_metrics() -> dict:
+    return {name: guard.metrics() for name, guard in _guards.items()}
@@ -0,0 +1,78 @@
+import logging
+import re
+import threading
+import time
+
+import numpy as np
+import whisper
+
+from config import config
+
+# Whisper models are loaded once per process and shared by every request.
+# Decoding installs forward hooks on the model for its KV cache, so calls on
+# the same instance must not overlap; `transcribe_audio` holds `transcribe_lock`
+# around every call.
+_model = None
+_ready = False
+_load_lock = threading.Lock()
+transcribe_lock = threading.Lock()
+
+
+def load_whisper_model():
+    """Load the configured Whisper model and run a short warmup decode"""
+    global _model, _ready
+    with _load_lock:
+        if _model is not None:
+            return _model
+
+        start = time.perf_counter()
+        model = whisper.load_model(config.WHISPER_MODEL, device=config.WHISPER_DEVICE)
+        logging.info(
+            f"Loaded Whisper model '{config.WHISPER_MODEL}' on {config.WHISPER_DEVICE} "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+
+        if config.WHISPER_WARMUP:
+            start = time.perf_counter()
+            # One second of silence is enough to build the kernels and caches
+            silence = np.zeros(whisper.audio.SAMPLE_RATE, dtype=np.float32)
+            with transcribe_lock:
+                model.transcribe(silence, fp16=config.WHISPER_DEVICE != "cpu")
+            logging.info(f"Whisper warmup decode finished in {time.perf_counter() - start:.2f}s")
+
+        _model = model
+        _ready = True
+        return _model
+
+
+def get_whisper_model():
+    """Return the shared Whisper model, loading it on first use if startup did not"""
+    if _model is None:
+        return load_whisper_model()
+    return _model
+
+
+def is_whisper_ready() -> bool:
+    """Whether the shared Whisper model is loaded and warmed up"""
+    return _ready
+
+
+def transcribe_audio(audio, **kwargs) -> dict:
+    """Transcribe a file path or 16 kHz float32 array with the shared model (blocking)"""
+    model = get_whisper_model()
+    kwargs.setdefault("fp16", config.WHISPER_DEVICE != "cpu")
+    with transcribe_lock:
+        return model.transcribe(audio, **kwargs)
+
+
+_TIMESTAMP_PATTERN = re.compile(r"\[\d{2}:\d{2}:\d{2}\.\d{3} --> \d{2}:\d{2}:\d{2}\.\d{3}\]")
+
+
+def clean_transcription(text: str) -> str:
+    """Remove timestamps like [00:00:00.000 --> 00:00:04.240] and join the lines"""
+    cleaned_lines = []
+    for line in text.strip().splitlines():
+        cleaned_line = _TIMESTAMP_PATTERN.sub("", line).strip()
+        if cleaned_line:
+            cleaned_lines.append(cleaned_line)
+    return " ".join(cleaned_lines)
@@ -77,19 +77,8 @@ function App() {
       // 2. Generate pose file for animation
       if (fswTokens.length > 0) {
         try {
-          const poseResponse = await ApiService.generatePose(textToTranslate, 'en', 'ase');
-          const { pose_data, data_format } = poseResponse;
-          if (data_format === 'binary_base64' && pose_data) {
-            const binary = atob(pose_data);
-            const bytes = new Uint8Array(binary.length);
-            for (let i = 0; i < binary.length; i++) {
-              bytes[i] = binary.charCodeAt(i);
-            }
-            const blob = new Blob([bytes], { type: 'application/octet-stream' });
-            setPoseFile(blob);
-          } else {
-            setPoseFile(null);
-          }
+          const poseBlob = await ApiService.generatePoseBinary(textToTranslate, 'en', 'ase');
+          setPoseFile(poseBlob.size > 0 ? poseBlob : null);
         } catch {
           setPoseFile(null);
         }
@@ -56,6 +56,15 @@ const ApiService = {
     );
     return response.data;
   },
+
+  async generatePoseBinary(text: string, spoken_language = 'en', signed_language = 'ase'): Promise<Blob> {
+    const response = await axios.post<Blob>(
+      API_ENDPOINTS.GENERATE_POSE,
+      { text, spoken_language, signed_language },
+      { params: { format: 'binary' }, responseType: 'blob' }
+    );
+    return response.data;
+  },
 };
 
 export default ApiService; 
\ No newline at end of file
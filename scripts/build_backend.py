@@ -43,7 +43,7 @@ a = Analysis(
     ['run_backend.py'],
     pathex=[],
     binaries=[],
-    datas=[('main.py', '.'), ('api', 'api')],
+    datas=[('main.py', '.'), ('api', 'api'), ('services', 'services'), ('data', 'data')],
     hiddenimports=[
         'fastapi', 'fastapi.middleware.cors', 'fastapi.middleware', 
         'fastapi.encoders', 'fastapi.dependencies', 'fastapi.security',
@@ -52,9 +52,9 @@ a = Analysis(
         'starlette.concurrency', 'starlette.datastructures', 'starlette.types',
         'uvicorn', 'uvicorn.protocols', 'uvicorn.protocols.http',
         'uvicorn.protocols.websockets', 'uvicorn.lifespan', 'pydantic',
-        'typing_extensions', 'python_multipart', 'requests', 'dotenv',
+        'typing_extensions', 'python_multipart', 'requests', 'httpx', 'h2', 'dotenv',
         'dotenv.main', 'jinja2', 'anyio', 'h11', 'torch', 'torch._C',
-        'signwriting_translation', 'signwriting_translation.bin', 'whisper',
+        'signwriting_translation', 'signwriting_translation.bin', 'whisper', 'pose_format',
         'pydantic_core', 'numpy', 'tqdm', 'numba'
     ],
     hookspath=[],
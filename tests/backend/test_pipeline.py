@@ -0,0 +1,29 @@
+import requests
+import json
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+def test_pipeline():
+    backend_url = os.getenv("BACKEND_URL", "http://127.0.0.1:8000")
+    url = f"{backend_url}/pipeline"
+    data = {"text": "Notwithstanding the inclement weather, the committee elected to proceed with the outdoor ceremony."}
+
+    with requests.post(url, data=data, stream=True) as response:
+        print("Status Code:", response.status_code)
+        for line in response.iter_lines():
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+                if "pose_data" in event:
+                    event["pose_data"] = f"<{len(event['pose_data'])} base64 chars>"
+                print("Event:", event)
+            except Exception as e:
+                print("Failed to parse NDJSON line:", e)
+                print("Line:", line)
+
+if __name__ == "__main__":
+    test_pipeline()
@@ -0,0 +1,36 @@
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "backend"))
+
+from starlette.datastructures import UploadFile
+
+from api.transcribe import decode_upload
+from services.audio_decoding import SAMPLE_RATE
+
+
+def test_wav_upload_decodes_without_ffmpeg(monkeypatch):
+    audio_path = "tests/test_file_converted.wav"  # 16 kHz mono PCM16
+
+    async def no_ffmpeg(*args, **kwargs):
+        raise AssertionError("ffmpeg must not be spawned for a 16 kHz PCM WAV")
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", no_ffmpeg)
+
+    # Starlette spools uploads into a file opened "w+b", exactly like this one
+    spooled = tempfile.SpooledTemporaryFile(mode="w+b")
+    with open(audio_path, "rb") as f:
+        shutil.copyfileobj(f, spooled)
+    spooled.seek(0)
+    upload = UploadFile(spooled, filename="test_file_converted.wav")
+
+    samples = asyncio.run(decode_upload(upload))
+    print("Decoded seconds:", samples.size / SAMPLE_RATE)
+    assert samples.size == 66219
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
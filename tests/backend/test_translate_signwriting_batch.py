@@ -0,0 +1,25 @@
+import requests
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+def test_translate_signwriting_batch():
+    backend_url = os.getenv("BACKEND_URL", "http://127.0.0.1:8000")
+    url = f"{backend_url}/translate_signwriting/batch"
+    texts = ["Hello", "How are you?", "Thank you", "See you later"]
+
+    response = requests.post(url, json={"texts": texts})
+    print("Status Code:", response.status_code)
+    try:
+        result = response.json()
+        print("Response JSON:", result)
+        for text, signwriting in zip(texts, result.get("signwriting", [])):
+            print(f"{text} -> {signwriting}")
+    except Exception as e:
+        print("Failed to parse JSON response:", e)
+        print("Response text:", response.text)
+
+if __name__ == "__main__":
+    test_translate_signwriting_batch()
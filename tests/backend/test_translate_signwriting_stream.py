@@ -0,0 +1,26 @@
+import requests
+import json
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+def test_translate_signwriting_stream():
+    backend_url = os.getenv("BACKEND_URL", "http://127.0.0.1:8000")
+    url = f"{backend_url}/translate_signwriting/stream"
+    text = "Hello. My name is John. How are you today? See you later."
+
+    with requests.post(url, json={"text": text}, stream=True) as response:
+        print("Status Code:", response.status_code)
+        for line in response.iter_lines():
+            if not line:
+                continue
+            try:
+                print("Event:", json.loads(line))
+            except Exception as e:
+                print("Failed to parse NDJSON line:", e)
+                print("Line:", line)
+
+if __name__ == "__main__":
+    test_translate_signwriting_stream()